@@ -1,14 +1,16 @@
-import json
 import random
 
-import pygame as pg
-
 import Jazz.colliders as jcol
 import Jazz.objects as jobj
 import Jazz.user_interface as jui
+from atlas import ATLAS
 from Jazz.baseObject import GameObject
 from Jazz.components import AnimatedSprite, Button, Label, Sprite
-from Jazz.utils import Vec2, clamp, direction_to, load_image
+from Jazz.utils import Vec2, direction_to, load_image
+from hud import HudLabel
+from levels import load_level
+from procedural import PROCEDURAL
+from tilemap import ChunkedTileMap, Tileset
 from weapon import ASSETS
 
 
@@ -31,8 +33,7 @@ class Upgrade(GameObject):
         self._bonus = kwargs.get("bonus", 1)
         self._type = kwargs.get("type", 1)
         sprite = AnimatedSprite(
-            spritesheet="./Assets/topdown_shooter/other/powerup.png",
-            sprite_dim=(16, 16),
+            spritesheet=ATLAS.sheet("./Assets/topdown_shooter/other/powerup.png"),
             animation_fps=8,
         )
         sprite._frame = random.randint(0, 4)
@@ -97,71 +98,41 @@ class WeaponPickup(GameObject):
             self.queue_kill()
 
 
-class Map(Sprite):
+class Map(GameObject):
     def __init__(self, name="map", **kwargs):
-        super().__init__(
-            name, asset="./Assets/Maps/map.png", background_layer=True, **kwargs
+        super().__init__(name, background_layer=True, **kwargs)
+        level = load_level(kwargs.get("map_file", "./Assets/Maps/map.tmj"))
+        self.map_size = level.map_size
+        self.tile_size = level.tile_size
+        self.tiles = ChunkedTileMap(
+            self.map_size,
+            level.tile_layers(),
+            Tileset(
+                kwargs.get("tileset", "./Assets/Maps/Dungeon_Tileset.png"),
+                self.tile_size,
+                level.firstgid,
+            ),
         )
-        with open("./Assets/Maps/map.tmj") as map_json:
-            map_data = json.load(map_json)
-        self.map_size = (map_data["width"], map_data["height"])
-        self.tile_size = (map_data["tilewidth"], map_data["tileheight"])
-
-        self.spawn_zones = []
-        self.spawn_area = 0
-
-        self.positions = {}
-
-        for layer in map_data["layers"]:
-            if layer.get("name", None) == "Walls":
-                for wall in layer["objects"]:
-                    wall_object = jobj.Body(
-                        pos=(
-                            wall["x"] + wall["width"] / 2,
-                            wall["y"] + wall["height"] / 2,
-                        ),
-                        layers="0101",
-                        static=True,
-                    )
-                    wall_object.add_child(
-                        jcol.RectCollider(wall["width"], wall["height"]), "collider"
-                    )
-                    self.add_child(wall_object)
-            if layer["name"] == "SpawnZones":
-                for area in layer["objects"]:
-                    area["area"] = area["width"] * area["height"]
-                    self.spawn_zones.append(area)
-                    self.spawn_area += area["area"]
-            if layer["name"] == "Positions":
-                for position in layer["objects"]:
-                    self.positions.setdefault(
-                        position["name"], Vec2(position["x"], position["y"])
-                    )
+        self.pixel_size = self.tiles.pixel_size
+
+        self.spawn_zones = level.spawn_zones
+        self.positions = {
+            name: Vec2(position) for name, position in level.positions.items()
+        }
+        self.walls = level.walls()
+
+        for rect in level.wall_rects:
+            wall_object = jobj.Body(pos=rect.center, layers="0101", static=True)
+            wall_object.add_child(
+                jcol.RectCollider(rect.width, rect.height), "collider"
+            )
+            self.add_child(wall_object)
+        level.close()
 
     def _draw(self, surface, offset=None):
         if offset is None:
             offset = Vec2()
-        draw_pos = self.sub_image(offset)
-        surface.blit(self.image, draw_pos)
-
-    def sub_image(self, offset):
-        x = clamp(-offset[0], 0, self.source.get_width() - self.scene.width)
-        y = clamp(-offset[1], 0, self.source.get_height() - self.scene.height)
-        self.image = self.source.subsurface(
-            (x, y), (self.scene.width, self.scene.height)
-        )
-        return Vec2(x, y) + offset
-
-    def get_spawn_point(self):
-        choice = random.uniform(0, self.spawn_area)
-        for zone in self.spawn_zones:
-            choice -= zone["area"]
-            if choice <= 0:
-                return (
-                    random.uniform(zone["x"], zone["x"] + zone["width"]),
-                    random.uniform(zone["y"], zone["y"] + zone["height"]),
-                )
-        return None
+        self.tiles.draw(surface, offset)
 
 
 class UI(GameObject):
@@ -174,7 +145,10 @@ class UI(GameObject):
         self.add_child(Label(text="Completed", pos=(0, 8), visible=False), "completed")
 
         self.showing_timer = False
-        self.add_child(Label(text="", pos=(0, 32), visible=False), "timer")
+        self.add_child(
+            HudLabel(pos=(0, 32), visible=False, quantum=0.1, format="{:.1f}"),
+            "timer",
+        )
 
     def show_card(self, time=3):
         self.showing_wave_card = True
@@ -195,13 +169,13 @@ class UI(GameObject):
         self.timer.visible = False
 
     def update_timer(self, time):
-        self.timer.set_text(str(round(time, 2)))
+        self.timer.set_value(time)
 
     def _draw(self, surface, offset=None):
         if offset is None:
             offset = Vec2()
         for enemy in self.enemy_flags:
-            pg.draw.circle(surface, "red", self.pos + enemy * 25 + offset, 3)
+            PROCEDURAL.blit(surface, self.pos + enemy * 25 + offset, "circle", 3, "red")
 
     def update(self, delta: float):
         self.enemy_flags = []
@@ -0,0 +1,121 @@
+import glob
+import os
+
+import pygame as pg
+
+ATLAS_DIRS = ["./Assets/player", "./Assets/enemies", "./Assets/Guns"]
+SHEETS = {
+    "./Assets/Bullet.png": (7, 7),
+    "./Assets/enemy_bullet.png": (8, 8),
+    "./Assets/HitParticleSheet.png": (16, 16),
+    "./Assets/topdown_shooter/other/powerup.png": (16, 16),
+}
+
+
+def _key(path):
+    return os.path.normpath(path)
+
+
+class Atlas:
+    """Packs many small images into a few converted pages.
+
+    frame() hands back a subsurface of a page and frames()/sheet() hand back
+    lists that are shared by every caller asking for the same images, so all
+    instances of a class animate off the same frame table.
+    """
+
+    def __init__(self, page_size=512, padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self._frames = {}
+        self._tables = {}
+        self.built = False
+
+    def build(self, paths, sheets):
+        images = {}
+        for path in paths:
+            images[_key(path)] = pg.image.load(path)
+        for path in sheets:
+            images[_key(path)] = pg.image.load(path)
+        placements = self._pack(images)
+        for page_index in range(
+            max((page for page, _ in placements.values()), default=-1) + 1
+        ):
+            page = pg.Surface((self.page_size, self.page_size), pg.SRCALPHA)
+            for key, (index, pos) in placements.items():
+                if index == page_index:
+                    page.blit(images[key], pos)
+            self.pages.append(page.convert_alpha())
+        for key, (index, pos) in placements.items():
+            self._frames[key] = self.pages[index].subsurface(
+                pg.Rect(pos, images[key].get_size())
+            )
+        for path, dim in sheets.items():
+            self._tables[_key(path)] = self._slice(self._frames[_key(path)], dim)
+        self.built = True
+
+    def _pack(self, images):
+        placements = {}
+        page, x, y, shelf = 0, 0, 0, 0
+        order = sorted(images, key=lambda key: images[key].get_height(), reverse=True)
+        for key in order:
+            width, height = images[key].get_size()
+            if width > self.page_size or height > self.page_size:
+                continue
+            if x + width > self.page_size:
+                x, y, shelf = 0, y + shelf + self.padding, 0
+            if y + height > self.page_size:
+                page, x, y, shelf = page + 1, 0, 0, 0
+            placements[key] = (page, (x, y))
+            x += width + self.padding
+            shelf = max(shelf, height)
+        return placements
+
+    @staticmethod
+    def _slice(image, dim):
+        width, height = dim
+        return [
+            image.subsurface((x, y, width, height))
+            for y in range(0, image.get_height() - height + 1, height)
+            for x in range(0, image.get_width() - width + 1, width)
+        ]
+
+    def frame(self, path):
+        key = _key(path)
+        image = self._frames.get(key)
+        if image is None:
+            image = pg.image.load(path).convert_alpha()
+            self._frames[key] = image
+        return image
+
+    def frames(self, paths):
+        key = tuple(_key(path) for path in paths)
+        table = self._tables.get(key)
+        if table is None:
+            table = [self.frame(path) for path in paths]
+            self._tables[key] = table
+        return table
+
+    def sheet(self, path, dim=None):
+        key = _key(path)
+        table = self._tables.get(key)
+        if table is None:
+            if dim is None:
+                dim = {_key(sheet): size for sheet, size in SHEETS.items()}[key]
+            table = self._slice(self.frame(path), dim)
+            self._tables[key] = table
+        return table
+
+
+ATLAS = Atlas()
+
+
+def build_atlas():
+    if ATLAS.built:
+        return ATLAS
+    paths = []
+    for directory in ATLAS_DIRS:
+        paths.extend(sorted(glob.glob(os.path.join(directory, "*.png"))))
+    ATLAS.build(paths, SHEETS)
+    return ATLAS
@@ -0,0 +1 @@
+from balance.simulator import FIELDS, BalanceRun, simulate
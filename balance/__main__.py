@@ -0,0 +1,140 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+
+from balance.simulator import FIELDS, simulate
+from timestep import frame_ms
+from weapon import WEAPON_TABLE
+
+SUMMARY_FIELDS = [
+    "weapon",
+    "level",
+    "start_difficulty",
+    "wave",
+    "runs",
+    "clear_rate",
+    "death_rate",
+    "time_to_clear_s",
+    "damage_taken",
+    "frame_ms_mean",
+]
+
+
+def parse_numbers(text, cast=int):
+    """ "0,5,10" or a range "0-10" (inclusive)."""
+    values = []
+    for part in text.split(","):
+        if "-" in part.strip()[1:]:
+            low, high = part.rsplit("-", 1)
+            values.extend(range(int(low), int(high) + 1))
+        else:
+            values.append(cast(part))
+    return values
+
+
+def summarize(rows):
+    groups = {}
+    for row in rows:
+        key = (row["weapon"], row["level"], row["start_difficulty"], row["wave"])
+        groups.setdefault(key, []).append(row)
+    summary = []
+    for (weapon, level, difficulty, wave), group in sorted(groups.items()):
+        cleared = [row for row in group if row["outcome"] == "cleared"]
+        summary.append(
+            {
+                "weapon": weapon,
+                "level": level,
+                "start_difficulty": difficulty,
+                "wave": wave,
+                "runs": len(group),
+                "clear_rate": round(len(cleared) / len(group), 3),
+                "death_rate": round(
+                    sum(row["outcome"] == "died" for row in group) / len(group), 3
+                ),
+                "time_to_clear_s": (
+                    round(
+                        sum(row["time_to_clear_s"] for row in cleared) / len(cleared), 2
+                    )
+                    if cleared
+                    else ""
+                ),
+                "damage_taken": round(
+                    sum(row["damage_taken"] for row in group) / len(group), 2
+                ),
+                "frame_ms_mean": round(
+                    sum(row["frame_ms_mean"] for row in group) / len(group), 3
+                ),
+            }
+        )
+    return summary
+
+
+def write_csv(path, fields, rows):
+    with open(path, "w", newline="") as out_file:
+        writer = csv.DictWriter(out_file, fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m balance",
+        description="Play Test scene waves headless with a bot over a grid of "
+        "weapons, levels and difficulties.",
+    )
+    parser.add_argument(
+        "--weapons", default=",".join(WEAPON_TABLE), help="comma separated"
+    )
+    parser.add_argument("--levels", default="0,5,10", help='e.g. "0,5,10" or "0-10"')
+    parser.add_argument("--difficulties", default="1,3,5")
+    parser.add_argument("--seeds", type=int, default=4, help="runs per grid point")
+    parser.add_argument("--waves", type=int, default=1, help="waves per run")
+    parser.add_argument("--max-seconds", type=float, default=180)
+    parser.add_argument("--delta", type=float, default=1 / 60)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="balance.csv", help="one row per wave")
+    parser.add_argument("--summary", help="averages per grid point and wave")
+    args = parser.parse_args()
+
+    try:
+        frame_ms(args.delta)
+    except ValueError as error:
+        parser.error(str(error))
+    weapons = args.weapons.split(",")
+    unknown = [weapon for weapon in weapons if weapon not in WEAPON_TABLE]
+    if unknown:
+        parser.error(f"unknown weapon: {', '.join(unknown)}")
+    jobs = [
+        (weapon, level, difficulty, seed, args.waves, args.max_seconds, args.delta)
+        for weapon in weapons
+        for level in parse_numbers(args.levels)
+        for difficulty in parse_numbers(args.difficulties, float)
+        for seed in range(args.seeds)
+    ]
+
+    rows = []
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.processes, maxtasksperchild=1) as pool:
+        for done, result in enumerate(pool.imap_unordered(simulate, jobs), 1):
+            rows.extend(result)
+            print(f"\r{done}/{len(jobs)} runs", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    rows.sort(key=lambda row: tuple(row[field] for field in FIELDS[:5]))
+    write_csv(args.out, FIELDS, rows)
+    summary = summarize(rows)
+    if args.summary:
+        write_csv(args.summary, SUMMARY_FIELDS, summary)
+    for row in summary:
+        print(
+            f"{row['weapon']:>8} L{row['level']:<2} d{row['start_difficulty']:<4} "
+            f"wave {row['wave']}: clear {row['clear_rate']:.0%} "
+            f"death {row['death_rate']:.0%}  t {row['time_to_clear_s']}s  "
+            f"damage {row['damage_taken']}  {row['frame_ms_mean']} ms/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
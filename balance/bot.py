@@ -0,0 +1,76 @@
+from Jazz.utils import Vec2
+from replay import KEYS, KeyState, MouseState
+
+THRESHOLD = 0.35
+
+
+class BotInput:
+    """Input provider driven by a Bot instead of the keyboard and mouse."""
+
+    def __init__(self):
+        self.key = KeyState(KEYS)
+        self.mouse = MouseState()
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+class Bot:
+    """Scripted player: aims at the nearest enemy, fires, and keeps its distance.
+
+    It backs off when an enemy is closer than `near`, closes in when the
+    nearest one is further than `far`, and otherwise strafes around it.
+    """
+
+    def __init__(self, near=96, far=200):
+        self.near = near
+        self.far = far
+        self.input = BotInput()
+        self._key_bits = {name: 1 << index for index, name in enumerate(KEYS)}
+
+    def _nearest(self, scene, pos):
+        nearest, best = None, None
+        for enemy in scene["enemies"]:
+            if enemy.do_kill:
+                continue
+            distance = (enemy.pos[0] - pos[0]) ** 2 + (enemy.pos[1] - pos[1]) ** 2
+            if best is None or distance < best:
+                nearest, best = enemy, distance
+        return nearest, best
+
+    def _move_bits(self, move):
+        length = move.magnitude()
+        if length == 0:
+            return 0
+        x, y = move.x / length, move.y / length
+        bits = self._key_bits
+        held = 0
+        if x > THRESHOLD:
+            held |= bits["d"]
+        elif x < -THRESHOLD:
+            held |= bits["a"]
+        if y > THRESHOLD:
+            held |= bits["s"]
+        elif y < -THRESHOLD:
+            held |= bits["w"]
+        return held
+
+    def step(self, scene):
+        player = scene.player
+        target, distance = self._nearest(scene, player.pos)
+        held = 0
+        firing = 0
+        if target is not None:
+            offset = Vec2(target.pos) - player.pos
+            if distance < self.near**2:
+                move = -offset
+            elif distance > self.far**2:
+                move = offset
+            else:
+                move = Vec2(-offset.y, offset.x)
+            held = self._move_bits(move)
+            self.input.mouse.global_pos = Vec2(target.pos)
+            firing = 1
+        self.input.key.set(held, 0)
+        self.input.mouse.set(firing, 0)
+        return self.input
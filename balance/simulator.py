@@ -0,0 +1,143 @@
+import time
+
+import headless
+from balance.bot import Bot
+from Jazz.global_dict import Game_Globals
+from scenes import Test
+from timestep import frame_ms
+
+FIELDS = [
+    "weapon",
+    "level",
+    "start_difficulty",
+    "seed",
+    "wave",
+    "difficulty",
+    "outcome",
+    "time_to_clear_s",
+    "damage_taken",
+    "hp_left",
+    "enemies_max",
+    "frame_ms_mean",
+    "frame_ms_p95",
+]
+
+
+class BalanceRun:
+    """Plays `waves` waves of the Test scene with a Bot and records one row per wave.
+
+    The player is armed with the given weapon and level, the scene starts at
+    `difficulty`, and upgrade cards between waves are discarded so every run
+    measures the stat formulas alone. A wave ends as "cleared", "died" or
+    "timeout" after `max_seconds` of simulated time, counted in the whole-ms
+    frame time the engine is actually given.
+    """
+
+    def __init__(
+        self, weapon, level, difficulty, seed, waves=1, max_seconds=180, delta=1 / 60
+    ):
+        self.weapon = weapon
+        self.level = level
+        self.difficulty = difficulty
+        self.seed = seed
+        self.waves = waves
+        self.max_seconds = max_seconds
+        self.delta = frame_ms(delta) / 1000
+        self.bot = Bot()
+        self.rows = []
+        self.scene = None
+        self._wave = None
+        self._last = None
+
+    def on_frame(self, frame):
+        scene = Game_Globals.get("Scene")
+        if self.scene is None:
+            if not isinstance(scene, Test) or not hasattr(scene, "player"):
+                return
+            if not headless.arm_player(scene, self.weapon, self.level):
+                return
+            scene.difficulty = self.difficulty
+            self.scene = scene
+
+        now = time.perf_counter()
+        if self._wave is not None:
+            self._track(scene, now)
+        self._last = now
+
+        if scene.game_over:
+            self._finish(scene, "died")
+            scene.app.stop()
+            return
+        if scene.upgrade_phase:
+            if self._wave is not None:
+                self._finish(scene, "cleared")
+                if len(self.rows) >= self.waves:
+                    scene.app.stop()
+                    return
+            for upgrade in scene["level_upgrade"]:
+                upgrade.queue_kill()
+        elif self._wave is None:
+            self._start(scene)
+        elif self._wave["frames"] * self.delta > self.max_seconds:
+            self._finish(scene, "timeout")
+            scene.app.stop()
+            return
+
+        if scene["_player"]:
+            Game_Globals["Input"] = self.bot.step(scene)
+
+    def _start(self, scene):
+        self._wave = {
+            "wave": scene.wave,
+            "difficulty": scene.difficulty,
+            "hp": scene.player._hp,
+            "damage": 0,
+            "frames": 0,
+            "enemies_max": 0,
+            "frame_ms": [],
+        }
+
+    def _track(self, scene, now):
+        wave = self._wave
+        wave["frames"] += 1
+        wave["frame_ms"].append((now - self._last) * 1000)
+        wave["enemies_max"] = max(wave["enemies_max"], len(scene["enemies"]))
+        if scene["_player"]:
+            hp = scene.player._hp
+            wave["damage"] += max(wave["hp"] - hp, 0)
+            wave["hp"] = hp
+        else:
+            wave["damage"] += max(wave["hp"], 0)
+            wave["hp"] = 0
+
+    def _finish(self, scene, outcome):
+        wave = self._wave
+        if wave is None:
+            return
+        self._wave = None
+        frame_ms = sorted(wave["frame_ms"]) or [0]
+        self.rows.append(
+            {
+                "weapon": self.weapon,
+                "level": self.level,
+                "start_difficulty": self.difficulty,
+                "seed": self.seed,
+                "wave": wave["wave"],
+                "difficulty": wave["difficulty"],
+                "outcome": outcome,
+                "time_to_clear_s": round(wave["frames"] * self.delta, 3),
+                "damage_taken": wave["damage"],
+                "hp_left": max(wave["hp"], 0),
+                "enemies_max": wave["enemies_max"],
+                "frame_ms_mean": round(sum(frame_ms) / len(frame_ms), 3),
+                "frame_ms_p95": round(frame_ms[round((len(frame_ms) - 1) * 0.95)], 3),
+            }
+        )
+
+
+def simulate(job):
+    weapon, level, difficulty, seed, waves, max_seconds, delta = job
+    run = BalanceRun(weapon, level, difficulty, seed, waves, max_seconds, delta)
+    frames = int(waves * (max_seconds + 30) / run.delta)
+    headless.run(frames=frames, delta=delta, seed=seed, on_frame=run.on_frame)
+    return run.rows
@@ -0,0 +1,53 @@
+import argparse
+import json
+
+from benchmarks.runner import run_all
+from benchmarks.scenarios import SCENARIOS
+
+
+def print_report(report, baseline=None):
+    for name, result in report["scenarios"].items():
+        line = (
+            f"{name:>10}  update p50/p95/p99 "
+            f"{result['update_ms']['p50']:.2f}/{result['update_ms']['p95']:.2f}/"
+            f"{result['update_ms']['p99']:.2f} ms  draw p95 "
+            f"{result['draw_ms']['p95']:.2f} ms  "
+            f"enemies {result['objects']['enemies']['max']}  "
+            f"bullets {result['objects']['bullets']['max']}"
+        )
+        if baseline and name in baseline["scenarios"]:
+            before = baseline["scenarios"][name]["frame_ms"]["p95"]
+            after = result["frame_ms"]["p95"]
+            line += f"  frame p95 {before:.2f} -> {after:.2f} ms"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run scripted Test scene benchmarks."
+    )
+    parser.add_argument(
+        "scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)"
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report from an earlier run")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    report = run_all(args.scenarios or list(SCENARIOS), args.frames, args.seed)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+    if args.out:
+        with open(args.out, "w") as out_file:
+            json.dump(report, out_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
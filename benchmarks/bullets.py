@@ -0,0 +1,129 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+import pygame as pg
+
+from atlas import build_atlas
+from benchmarks.runner import percentiles
+from Jazz.utils import Vec2
+from levels import load_level
+from pools import tick_pools
+from projectiles import Projectiles
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class Dummy:
+    """Stands in for an enemy: a circle that takes hits and never dies."""
+
+    def __init__(self, pos, radius=8):
+        self.pos = Vec2(pos)
+        self._radius = radius
+        self._layers = "0101"
+        self.do_kill = False
+        self.hits = 0
+
+    def take_damage(self, damage, source):
+        self.hits += 1
+
+    def knockback(self, amount, source):
+        pass
+
+
+class Map:
+    def __init__(self, walls):
+        self.walls = walls
+
+
+class Scene:
+    """Just enough of the Test scene for Projectiles: walls and add_object."""
+
+    def __init__(self, walls):
+        self.map = Map(walls)
+
+    def add_object(self, obj):
+        obj.queue_kill()
+
+
+def open_points(walls, count):
+    points = []
+    while len(points) < count:
+        x = random.uniform(0, walls.width * walls.tile_width)
+        y = random.uniform(0, walls.height * walls.tile_height)
+        if not walls.circle_blocked(x, y, 10):
+            points.append((x, y))
+    return points
+
+
+def run(bullets=5000, targets=200, frames=600, level="./Assets/Maps/map_2.tmj"):
+    """Keeps `bullets` live bullets among `targets` Dummies and times each update."""
+    pg.display.set_mode((1, 1))
+    build_atlas()
+    with load_level(level) as compiled:
+        walls = compiled.walls()
+    enemies = [Dummy(pos) for pos in open_points(walls, targets)]
+    projectiles = Projectiles(target_groups=[enemies])
+    projectiles.scene = Scene(walls)
+    sources = open_points(walls, 64)
+    frames_list = [pg.Surface((8, 8))]
+
+    update_ms = []
+    for _ in range(frames):
+        for _ in range(bullets - len(projectiles)):
+            projectiles.spawn_volley(
+                random.choice(sources),
+                random.uniform(0, 360),
+                0,
+                1,
+                random.uniform(150, 600),
+                0,
+                1,
+                "0100",
+                frames_list,
+                None,
+            )
+        tick_pools()
+        start = time.perf_counter()
+        projectiles.update(1 / 60)
+        update_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "bullets": bullets,
+        "targets": targets,
+        "frames": frames,
+        "update_ms": percentiles(update_ms),
+        "hits": sum(enemy.hits for enemy in enemies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bullets",
+        description="Time Projectiles.update with thousands of live bullets.",
+    )
+    parser.add_argument("--bullets", type=int, default=5000)
+    parser.add_argument("--targets", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    result = run(args.bullets, args.targets, args.frames)
+    update_ms = result["update_ms"]
+    verdict = "within" if update_ms["p95"] <= FRAME_BUDGET_MS else "OVER"
+    print(
+        f"{result['bullets']} bullets, {result['targets']} targets: update "
+        f"p50/p95/p99 {update_ms['p50']:.2f}/{update_ms['p95']:.2f}/"
+        f"{update_ms['p99']:.2f} ms, {verdict} the {FRAME_BUDGET_MS:.1f} ms "
+        f"frame budget ({result['hits']} hits)"
+    )
+    if verdict != "within":
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import gc
+import multiprocessing
+import subprocess
+import sys
+import time
+
+import headless
+from Jazz.baseObject import GameObject
+from Jazz.global_dict import Game_Globals
+from pools import pool_stats
+from scenes import Test
+
+
+def percentiles(values, points=(50, 95, 99)):
+    if not values:
+        return {f"p{point}": 0 for point in points}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{point}": ordered[round(last * point / 100)] for point in points}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class DrawTimer:
+    """Wraps every _draw so the time spent drawing each frame can be split out."""
+
+    def __init__(self):
+        self.total = 0
+        self._depth = 0
+
+    def install(self):
+        classes = [GameObject]
+        while classes:
+            cls = classes.pop()
+            if "_draw" in cls.__dict__:
+                cls._draw = self._wrap(cls.__dict__["_draw"])
+            classes.extend(cls.__subclasses__())
+
+    def _wrap(self, draw):
+        def timed_draw(obj, surface, offset=None):
+            if self._depth:
+                return draw(obj, surface, offset)
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return draw(obj, surface, offset)
+            finally:
+                self.total += time.perf_counter() - start
+                self._depth -= 1
+
+        return timed_draw
+
+    def take(self):
+        total, self.total = self.total, 0
+        return total
+
+
+class Recorder:
+    def __init__(self, scenario, frames, draw_timer):
+        self.scenario = scenario
+        self.frames = frames
+        self.draw_timer = draw_timer
+        self.scene = None
+        self.start_frame = None
+        self.last = None
+        self.last_blocks = 0
+        self.gc_start = 0
+        self.update_ms = []
+        self.draw_ms = []
+        self.frame_ms = []
+        self.alloc_blocks = []
+        self.objects = {"enemies": [], "bullets": [], "particles": []}
+
+    def on_frame(self, frame):
+        now = time.perf_counter()
+        scene = Game_Globals.get("Scene")
+        if self.scene is None:
+            if not isinstance(scene, Test) or not hasattr(scene, "player"):
+                return
+            self.scene = scene
+            self.scenario.setup(scene)
+            self.start_frame = frame
+            self.gc_start = gc_collections()
+        else:
+            frame_time = now - self.last
+            draw_time = self.draw_timer.take()
+            blocks = sys.getallocatedblocks()
+            self.frame_ms.append(frame_time * 1000)
+            self.draw_ms.append(draw_time * 1000)
+            self.update_ms.append((frame_time - draw_time) * 1000)
+            self.alloc_blocks.append(blocks - self.last_blocks)
+            self.count_objects(scene)
+            if frame - self.start_frame >= self.frames:
+                scene.app.stop()
+            self.scenario.step(scene, frame - self.start_frame)
+        self.draw_timer.take()
+        self.last_blocks = sys.getallocatedblocks()
+        self.last = time.perf_counter()
+
+    def count_objects(self, scene):
+        pools = pool_stats()
+        self.objects["enemies"].append(len(scene["enemies"]))
+        self.objects["bullets"].append(
+            len(scene.projectiles) + pools["Bullet"]["active"]
+        )
+        self.objects["particles"].append(pools["HitParticle"]["active"])
+
+    def report(self):
+        return {
+            "description": self.scenario.description,
+            "frames": len(self.frame_ms),
+            "frame_ms": percentiles(self.frame_ms),
+            "update_ms": percentiles(self.update_ms),
+            "draw_ms": percentiles(self.draw_ms),
+            "alloc_blocks": {
+                **percentiles(self.alloc_blocks),
+                "total": sum(self.alloc_blocks),
+            },
+            "gc_collections": gc_collections() - self.gc_start,
+            "objects": {
+                name: {
+                    "mean": sum(counts) / max(len(counts), 1),
+                    "max": max(counts, default=0),
+                }
+                for name, counts in self.objects.items()
+            },
+            "pools": pool_stats(),
+        }
+
+
+def gc_collections():
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+def run_scenario(name, frames=600, seed=0):
+    from benchmarks.scenarios import SCENARIOS
+
+    draw_timer = DrawTimer()
+    draw_timer.install()
+    recorder = Recorder(SCENARIOS[name], frames, draw_timer)
+    headless.run(frames=None, seed=seed, render=True, on_frame=recorder.on_frame)
+    return recorder.report()
+
+
+def run_all(names, frames=600, seed=0):
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(run_scenario, (name, frames, seed))
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "frames": frames,
+        "seed": seed,
+        "scenarios": results,
+    }
@@ -0,0 +1,113 @@
+import random
+
+from Jazz.utils import Vec2, direction_to
+
+
+def ring(center, inner, outer):
+    offset = Vec2(random.uniform(inner, outer), 0).rotate(random.uniform(0, 360))
+    return Vec2(center) + offset
+
+
+class Scenario:
+    name = "idle"
+    description = "Test scene with no enemies."
+
+    def setup(self, scene):
+        for pickup in scene["level_weapons"]:
+            pickup.queue_kill()
+        scene.upgrade_phase = False
+        scene.wave_count = 0
+
+    def step(self, scene, frame):
+        scene.player.heal(scene.player._max_hp)
+
+
+class Chasers(Scenario):
+    name = "chasers"
+    description = "N Chasers converging on the player."
+
+    def __init__(self, count=200):
+        self.count = count
+
+    def setup(self, scene):
+        super().setup(scene)
+        for _ in range(self.count):
+            scene.spawn_chaser(ring(scene.player.pos, 100, 240))
+
+
+class Towers(Scenario):
+    name = "towers"
+    description = "M Towers in range of the player, bursting at high rof."
+
+    def __init__(self, count=24, difficulty=10):
+        self.count = count
+        self.difficulty = difficulty
+
+    def setup(self, scene):
+        super().setup(scene)
+        scene.difficulty = self.difficulty
+        for _ in range(self.count):
+            scene.spawn_tower(ring(scene.player.pos, 60, 140))
+
+
+class Firing(Scenario):
+    description = "Player sweeping a level 10 weapon over a ring of Targets."
+
+    def __init__(self, targets=20, level=10):
+        self.targets = targets
+        self.level = level
+
+    def setup(self, scene):
+        super().setup(scene)
+        scene.player.weapon.set_type(self.weapon, self.level)
+
+    def step(self, scene, frame):
+        super().step(scene, frame)
+        for _ in range(self.targets - len(scene["enemies"])):
+            scene.spawn_target(ring(scene.player.pos, 80, 200))
+        scene.player.weapon.facing = Vec2(1, 0).rotate(frame * 3)
+        scene.player.weapon.fire()
+
+
+class SMG(Firing):
+    name = "smg"
+    weapon = "SMG"
+
+
+class Shotgun(Firing):
+    name = "shotgun"
+    weapon = "Shotgun"
+
+
+class Wave(Scenario):
+    name = "wave10"
+    description = "Regular wave spawning at the difficulty of wave 10."
+
+    def __init__(self, wave=10, weapon="Assault", level=5):
+        self.wave = wave
+        self.weapon = weapon
+        self.level = level
+
+    def setup(self, scene):
+        for pickup in scene["level_weapons"]:
+            pickup.queue_kill()
+        scene.player.weapon.set_type(self.weapon, self.level)
+        scene.wave = self.wave - 1
+        scene.difficulty = 1 + 0.5 * (self.wave - 1)
+
+    def step(self, scene, frame):
+        super().step(scene, frame)
+        enemies = scene["enemies"]
+        if enemies:
+            nearest = min(
+                enemies,
+                key=lambda enemy: enemy.pos.distance_squared_to(scene.player.pos),
+            )
+            scene.player.weapon.facing = direction_to(scene.player.pos, nearest.pos)
+            scene.player.weapon.fire()
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (Scenario(), Chasers(), Towers(), SMG(), Shotgun(), Wave())
+}
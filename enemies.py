@@ -5,15 +5,18 @@ import pygame as pg
 import Jazz.colliders as jcol
 import Jazz.objects as jobj
 from actors import Upgrade
-from Jazz.components import AnimatedSprite, ProgressBar
+from atlas import ATLAS
+from Jazz.components import AnimatedSprite
 from Jazz.utils import Vec2, direction_to, dist_to
-from weapon import Weapon
+from procedural import PROCEDURAL
+from weapon import Weapon, WeaponStats
 
 
 class Enemy(jobj.Body):
     IDLE = 0
     ATTACKING = 1
     STATES = ["idle", "attacking"]
+    pool = None
 
     def __init__(self, **kwargs):
         kwargs.setdefault("name", "Enemy")
@@ -26,27 +29,56 @@ class Enemy(jobj.Body):
         self._state = self.IDLE
         self._last_state = self.IDLE
 
+        self._hp_shown = False
+        self._ai_elapsed = 0.0
+        self._ai_slot = None
+        self.sight_range = kwargs.get("sight_range", 0)
+        self.sighted = ()
+        self._in_groups = bool(kwargs.get("groups"))
+
         self.add_child(jcol.CircleCollider(self._radius, pos=(0, 0)), "collider")
-        self.add_child(
-            ProgressBar(
-                self._hp,
-                self._hp_max,
-                size=Vec2(32, 6),
-                line_width=1,
-                pos=(0, -32),
-                visible=False,
-                color="red",
-            ),
-            "hp_bar",
-        )
+
+    def reset(self, **kwargs):
+        self.do_kill = False
+        self.pos = Vec2(kwargs.get("pos", (0, 0)))
+        self._drop_chance = kwargs.get("drop_chance", 15)
+        self._hp_max = kwargs.get("hp_max", 10)
+        self._hp = self._hp_max
+        self._state = self.IDLE
+        self._last_state = self.IDLE
+
+        self._hp_shown = False
+        self._ai_elapsed = 0.0
+        self._ai_slot = None
+        self.sight_range = kwargs.get("sight_range", 0)
+        self.sighted = ()
+
+        # The scene drops killed objects from their groups, so a pooled enemy
+        # only needs to rejoin them once per kill.
+        if not self._in_groups:
+            for group in kwargs.get("groups", ()):
+                group.append(self)
+            self._in_groups = True
+
+    def queue_kill(self):
+        if not self.do_kill:
+            self._in_groups = False
+            if self.pool is not None:
+                self.pool.release(self)
+        super().queue_kill()
 
     def update(self, delta):
-        self.state_logic(delta)
+        elapsed = self.scene.ai_scheduler.elapsed(self, delta)
+        if elapsed is not None:
+            self.state_logic(elapsed)
         self._state = self.get_state_change(delta)
         if self._state != self._last_state:
             self.change_state(delta)
             self._last_state = self._state
 
+    def awake(self):
+        return False
+
     def state_logic(self, delta):
         ...
 
@@ -73,8 +105,7 @@ class Enemy(jobj.Body):
                 self.spawn_upgrade()
             self.queue_kill()
         else:
-            self.hp_bar.visible = True
-            self.hp_bar.update_value(self._hp)
+            self._hp_shown = True
 
 
 class Target(Enemy):
@@ -87,12 +118,13 @@ class Target(Enemy):
             **kwargs,
         )
 
+    def reset(self, radius, **kwargs):
+        super().reset(radius=radius, **kwargs)
+
     def _draw(self, surface, offset=None):
         if offset is None:
             offset = Vec2()
-        pg.draw.circle(surface, "red", self.pos + offset, self._radius)
-        pg.draw.circle(surface, "white", self.pos + offset, self._radius * 0.66)
-        pg.draw.circle(surface, "red", self.pos + offset, self._radius * 0.33)
+        PROCEDURAL.blit(surface, self.pos + offset, "target", self._radius)
 
 
 class Tower(Enemy):
@@ -100,16 +132,18 @@ class Tower(Enemy):
     ATTACKING_ANIM = [f"Assets/enemies/wogol_run_anim_f{i}.png" for i in range(4)]
 
     def __init__(self, range=160, **kwargs):
-        super().__init__(name="Tower", radius=8, static=True, **kwargs)
+        super().__init__(
+            name="Tower", radius=8, static=True, sight_range=range, **kwargs
+        )
         self.target_group = kwargs.get("target_group")
         self.add_child(
-            AnimatedSprite(pos=(0, -4), spritesheet=self.IDLE_ANIM, animation_fps=10),
+            AnimatedSprite(
+                pos=(0, -4),
+                spritesheet=ATLAS.frames(self.IDLE_ANIM),
+                animation_fps=10,
+            ),
             "sprite",
         )
-        self.add_child(
-            jobj.Area(target_group=self.target_group, collision_layers="0010"), "sight"
-        )
-        self.sight.add_child(jcol.CircleCollider(range), "collider")
         self.add_child(
             Weapon(
                 target_layers="0011",
@@ -130,6 +164,29 @@ class Tower(Enemy):
         self.burst_cooldown = kwargs.get("burst_cooldown", 1)
         self._burst_timer = self.burst_cooldown
 
+    def reset(self, range=160, **kwargs):
+        super().reset(sight_range=range, **kwargs)
+        self.target_group = kwargs.get("target_group")
+        self.sprite.flip_x = False
+        self.weapon.rotation = 0
+        self.weapon._cooldown = 0
+        self.weapon.stats = WeaponStats(
+            damage=kwargs.get("damage", 5),
+            rof=kwargs.get("rof", 3),
+            projectiles=1,
+            spread=0,
+        )
+        self.idle_timer = 0
+        self.idle_rotation = 0
+        self.target = None
+        self.burst = kwargs.get("burst_size", 3)
+        self._burst_count = self.burst
+        self.burst_cooldown = kwargs.get("burst_cooldown", 1)
+        self._burst_timer = self.burst_cooldown
+
+    def awake(self):
+        return self._state == self.ATTACKING
+
     def state_logic(self, delta):
         if self._state == self.IDLE:
             if self.idle_timer <= 0:
@@ -157,12 +214,12 @@ class Tower(Enemy):
 
     def get_state_change(self, delta):
         if self._state == self.IDLE:
-            if self.sight.entered:
+            if self.sighted:
                 return self.ATTACKING
             else:
                 return self.IDLE
         if self._state == self.ATTACKING:
-            if not self.sight.entered:
+            if not self.sighted:
                 return self.IDLE
             else:
                 return self.ATTACKING
@@ -172,7 +229,7 @@ class Tower(Enemy):
             self.target = None
             self.idle_timer = random.uniform(0.5, 2)
         if self._state == self.ATTACKING:
-            self.target = self.sight.entered[0]
+            self.target = self.sighted[0]
             self._burst_timer = self.burst_cooldown / 2
 
 
@@ -181,23 +238,21 @@ class Chaser(Enemy):
     ATTACKING_ANIM = [f"Assets/enemies/chort_run_anim_f{i}.png" for i in range(4)]
 
     def __init__(self, range=250, **kwargs):
-        super().__init__(name="Chaser", radius=8, static=True, **kwargs)
+        super().__init__(
+            name="Chaser", radius=8, static=True, sight_range=range, **kwargs
+        )
         self._color = (255, 0, 0)
         self.target_group = kwargs.get("target_group")
         self.friend_group = kwargs.get("friend_group")
         self.add_child(
-            AnimatedSprite(pos=(0, -4), spritesheet=self.IDLE_ANIM, animation_fps=10),
+            AnimatedSprite(
+                pos=(0, -4),
+                spritesheet=ATLAS.frames(self.IDLE_ANIM),
+                animation_fps=10,
+            ),
             "sprite",
         )
-        self.add_child(
-            jobj.Area(target_group=self.target_group, collision_layers="0010"), "sight"
-        )
-        self.sight.add_child(jcol.CircleCollider(range), "collider")
-        self.add_child(
-            jobj.Area(target_group=self.friend_group, collision_layers="0100"),
-            "friend_sight",
-        )
-        self.friend_sight.add_child(jcol.CircleCollider(24), "collider")
+        self.friend_range = kwargs.get("friend_range", 24)
         self.idle_timer = 0
         self.aggro_timer = 0
         self.aggro_target = None
@@ -206,28 +261,59 @@ class Chaser(Enemy):
         self.damage = kwargs.get("damage", 5)
         self.speed = kwargs.get("speed", 100)
 
+    def reset(self, range=250, **kwargs):
+        super().reset(sight_range=range, **kwargs)
+        self.target_group = kwargs.get("target_group")
+        self.friend_group = kwargs.get("friend_group")
+        self.friend_range = kwargs.get("friend_range", 24)
+        self.idle_timer = 0
+        self.aggro_timer = 0
+        self.aggro_target = None
+        self._vel = Vec2()
+        self.damage = kwargs.get("damage", 5)
+        self.speed = kwargs.get("speed", 100)
+
+    def awake(self):
+        return self.aggro_timer > 0 or bool(self.sighted)
+
     def update(self, delta):
+        delta = self.scene.ai_scheduler.elapsed(self, delta)
+        if delta is None:
+            return
         desired_vel = Vec2()
         if self.aggro_timer > 0:
-            desired_vel = direction_to(self.pos, self.aggro_target.pos) * self.speed
+            desired_vel = (
+                self.scene.flow_field.direction(self.pos, self.aggro_target.pos)
+                * self.speed
+            )
             self.aggro_timer -= delta
             if self.aggro_timer <= 0:
                 self.aggro_timer = 0
                 self.aggro_target = None
-        if self.sight.entered:
-            desired_vel = direction_to(self.pos, self.sight.entered[0].pos) * self.speed
-        for friend in self.friend_sight.entered:
-            if friend is not self:
-                desired_vel += (
-                    (direction_to(friend.pos, self.pos) * self.speed / 3)
-                    * 48**2
-                    / (dist_to(self.pos, friend.pos)) ** 2
-                )
+        if self.sighted:
+            desired_vel = (
+                self.scene.flow_field.direction(self.pos, self.sighted[0].pos)
+                * self.speed
+            )
+        for friend in self.scene.enemy_hash.query(
+            self.pos, self.friend_range, exclude=self
+        ):
+            distance = dist_to(self.pos, friend.pos)
+            if distance == 0:
+                continue
+            desired_vel += (
+                (direction_to(friend.pos, self.pos) * self.speed / 3)
+                * 48**2
+                / distance**2
+            )
 
         self._vel += (desired_vel - self._vel) / 10
         if self._vel.magnitude_squared() > self.speed**2:
             self._vel.scale_to_length(self.speed)
-        collisions = self.move_and_collide(self._vel * delta)
+        motion = self.scene.map.walls.slide_circle(
+            self.pos, self._radius, self._vel * delta
+        )
+        collisions = self.move_and_collide(motion)
         for obj, _data in collisions:
             if obj in self.target_group:
                 obj.take_damage(self.damage, self.name)
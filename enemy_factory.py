@@ -0,0 +1,114 @@
+import random
+import time
+
+from enemies import Chaser, Target, Tower
+from pools import ObjectPool
+
+TIER = 0.5
+TARGET_POOL = ObjectPool(Target, cap=64)
+TOWER_POOL = ObjectPool(Tower, cap=64)
+CHASER_POOL = ObjectPool(Chaser, cap=64)
+
+
+def _target_template(scene, difficulty):
+    return {"hp_max": difficulty * 10}
+
+
+def _tower_template(scene, difficulty):
+    return {
+        "hp_max": difficulty * 15,
+        "damage": difficulty + 3,
+        "rof": difficulty + 1.5,
+        "range": 150 + 10 * difficulty,
+        "burst_size": 3,
+        "burst_cooldown": 1,
+        "target_group": scene["_player"],
+    }
+
+
+def _chaser_template(scene, difficulty):
+    return {
+        "hp_max": difficulty * 20,
+        "damage": difficulty * 5,
+        "speed": difficulty * 25 + 100,
+        "target_group": scene["_player"],
+        "friend_group": scene["enemies"],
+    }
+
+
+TEMPLATES = {
+    "target": _target_template,
+    "tower": _tower_template,
+    "chaser": _chaser_template,
+}
+POOLS_BY_KIND = {"tower": TOWER_POOL, "chaser": CHASER_POOL}
+
+
+class EnemyFactory:
+    """Spawns enemies from per-difficulty templates and pooled instances.
+
+    A template is the constructor kwargs of one enemy type at one difficulty
+    tier, worked out once. Towers and Chasers come back out of their pool
+    through reset(), and Targets are pooled by radius. warm() builds spare
+    Towers and Chasers one a call, so between waves the construction cost
+    is spread over the countdown instead of landing on the wave's first frame.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self._templates = {}
+        self.spawned = 0
+        self.warmed = 0
+        self.spawn_ms = 0.0
+        self.spawn_ms_max = 0.0
+
+    def template(self, kind, difficulty):
+        tier = round(difficulty / TIER) * TIER
+        template = self._templates.get((kind, tier))
+        if template is None:
+            template = TEMPLATES[kind](self.scene, tier)
+            self._templates[(kind, tier)] = template
+        return template
+
+    def spawn(self, kind, pos):
+        start = time.perf_counter()
+        template = self.template(kind, self.scene.difficulty)
+        groups = [self.scene["enemies"]]
+        if kind == "target":
+            radius = random.randint(5, 16)
+            enemy = TARGET_POOL.acquire(
+                radius, radius, pos=pos, groups=groups, **template
+            )
+        else:
+            enemy = POOLS_BY_KIND[kind].acquire(
+                kind, pos=pos, groups=groups, **template
+            )
+        self.scene.add_object(enemy)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.spawned += 1
+        self.spawn_ms += elapsed
+        self.spawn_ms_max = max(self.spawn_ms_max, elapsed)
+        return enemy
+
+    def warm(self, difficulty, spare=5):
+        """Builds at most one spare Tower or Chaser; returns False once both have `spare`."""
+        for kind, pool in POOLS_BY_KIND.items():
+            if pool.free(kind) < spare:
+                if pool.prefill(kind, **self.template(kind, difficulty)) is None:
+                    continue
+                self.warmed += 1
+                return True
+        return False
+
+    def stats(self):
+        pools = (TARGET_POOL, TOWER_POOL, CHASER_POOL)
+        return {
+            "spawned": self.spawned,
+            "created": sum(pool.created for pool in pools),
+            "reused": sum(pool.reused for pool in pools),
+            "warmed": self.warmed,
+            "templates": len(self._templates),
+            "spawn_ms_mean": round(self.spawn_ms / max(self.spawned, 1), 3),
+            "spawn_ms_max": round(self.spawn_ms_max, 3),
+        }
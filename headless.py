@@ -0,0 +1,153 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+import pygame as pg
+
+import Jazz
+import Jazz.user_interface as jui
+from Jazz.baseObject import GameObject
+from Jazz.global_dict import Game_Globals
+from replay import ReplayClock, start_replay
+from scenes import Test
+from timestep import frame_ms
+from tracing import start_tracing, stop_tracing
+
+
+class FixedClock:
+    """Stands in for the app's pygame Clock: every tick is exactly `delta`.
+
+    `delta` is rounded to whole ms like a real Clock, and the rounded value is
+    what `clock.delta` reports. tick() never sleeps, so the app loop runs as
+    fast as the CPU allows. The clock stops the app after `frames` ticks and
+    calls `on_frame(frame)` at the start of every frame.
+    """
+
+    def __init__(self, app, delta=1 / 60, frames=None, on_frame=None):
+        self.app = app
+        self.ms = frame_ms(delta)
+        self.delta = self.ms / 1000
+        self.frames = frames
+        self.on_frame = on_frame
+        self.frame = 0
+        self.started = time.perf_counter()
+
+    def tick(self, framerate=0):
+        if self.frames is not None and self.frame >= self.frames:
+            self.app.stop()
+        elif self.on_frame is not None:
+            self.on_frame(self.frame)
+        self.frame += 1
+        return self.get_time()
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.ms
+
+    get_rawtime = get_time
+
+    def get_fps(self):
+        return 1 / self.delta
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def _no_draw(self, surface, offset=None):
+    pass
+
+
+def skip_drawing():
+    classes = [GameObject]
+    while classes:
+        cls = classes.pop()
+        if "_draw" in cls.__dict__ or cls is GameObject:
+            cls._draw = _no_draw
+        classes.extend(cls.__subclasses__())
+    pg.display.flip = lambda: None
+    pg.display.update = lambda *args: None
+
+
+def arm_player(scene, weapon_type="Assault", level=0):
+    if not isinstance(scene, Test) or scene.wave > 0:
+        return False
+    pickups = [pickup for pickup in scene["level_weapons"] if not pickup.do_kill]
+    if not pickups:
+        return False
+    scene.player.weapon.set_type(weapon_type, level)
+    for pickup in pickups:
+        pickup.queue_kill()
+    return True
+
+
+def make_app(seed=0, render=False):
+    random.seed(seed)
+    if not render:
+        skip_drawing()
+    app = Jazz.Application(720, 405)
+    app.add_scene(Test)
+    jui.set_default_font(pg.font.Font(None, 12))
+    return app
+
+
+def run(frames=3600, delta=1 / 60, seed=0, render=False, on_frame=None):
+    app = make_app(seed, render)
+    clock = FixedClock(app, delta, frames, on_frame)
+    app._clock = clock
+    app.run()
+    return clock
+
+
+def replay(path, render=False):
+    recording = start_replay(path).recording
+    app = make_app(recording.seed, render)
+    clock = ReplayClock(app, recording.frame_ms())
+    app._clock = clock
+    app.run()
+    return clock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Test scene headless.")
+    parser.add_argument("--frames", type=int, default=3600)
+    parser.add_argument("--delta", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--weapon", default="Assault")
+    parser.add_argument("--level", type=int, default=0)
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument(
+        "--trace", help="write frame telemetry to a .json (Chrome) or .jsonl file"
+    )
+    parser.add_argument("--replay", help="play back an input recording instead")
+    args = parser.parse_args()
+    try:
+        frame_ms(args.delta)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.trace:
+        start_tracing(args.trace)
+
+    def on_frame(frame):
+        arm_player(Game_Globals.get("Scene"), args.weapon, args.level)
+
+    if args.replay:
+        clock = replay(args.replay, args.render)
+    else:
+        clock = run(args.frames, args.delta, args.seed, args.render, on_frame)
+    stop_tracing()
+    elapsed = clock.elapsed()
+    print(
+        f"{clock.frame} frames in {elapsed:.2f}s "
+        f"({clock.frame / elapsed:.0f} frames/s, "
+        f"{clock.frame * clock.delta / elapsed:.1f}x real time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import Jazz.user_interface as jui
+from Jazz.baseObject import GameObject
+from Jazz.utils import Vec2
+from procedural import PROCEDURAL
+
+
+class TextCache:
+    """Rendered text runs keyed by (font, text, color), least recently used first out."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.renders = 0
+        self._runs = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (id(font), text, color)
+        run = self._runs.get(key)
+        if run is not None:
+            self._runs.move_to_end(key)
+            return run[1]
+        image = font.render(text, True, color)
+        self.renders += 1
+        self._runs[key] = (font, image)
+        if len(self._runs) > self.max_entries:
+            self._runs.popitem(last=False)
+        return image
+
+
+TEXT_CACHE = TextCache()
+
+
+class OnChange:
+    """Calls apply(value) only when set() is given a value different from the last."""
+
+    _UNSET = object()
+
+    def __init__(self, apply):
+        self.apply = apply
+        self.value = self._UNSET
+
+    def set(self, value):
+        if value != self.value:
+            self.value = value
+            self.apply(value)
+
+
+class HudLabel(GameObject):
+    def __init__(self, name="HudLabel", **kwargs):
+        super().__init__(name, **kwargs)
+        self.font = kwargs.get("font", None)
+        self.color = kwargs.get("color", "white")
+        self.quantum = kwargs.get("quantum", None)
+        self.format = kwargs.get("format", "{}")
+        self.image = None
+        self._text = None
+        self.set_text(kwargs.get("text", ""))
+
+    @property
+    def text(self):
+        return self._text
+
+    def set_text(self, text):
+        if text == self._text:
+            return
+        self._text = text
+        self.image = None
+
+    def set_value(self, value):
+        if self.quantum:
+            value = round(value / self.quantum) * self.quantum + 0.0
+        self.set_text(self.format.format(value))
+
+    def _draw(self, surface, offset=None):
+        if offset is None:
+            offset = Vec2()
+        if not self._text:
+            return
+        if self.image is None:
+            self.image = TEXT_CACHE.render(
+                self.font or jui.DEFAULT_FONT, self._text, self.color
+            )
+        surface.blit(
+            self.image,
+            (
+                self.pos[0] + offset[0] - self.image.get_width() / 2,
+                self.pos[1] + offset[1] - self.image.get_height() / 2,
+            ),
+        )
+
+
+class HealthBars(GameObject):
+    """One overlay that draws the health bar of every damaged object in a group.
+
+    Objects opt in by setting _hp_shown; the bars are blitted together from a
+    shared outline and fill sprite, so no object needs a bar child of its own.
+    """
+
+    def __init__(self, name="HealthBars", **kwargs):
+        super().__init__(name, **kwargs)
+        self.group = kwargs.get("group")
+        self.size = tuple(kwargs.get("size", (32, 6)))
+        self.bar_offset = Vec2(kwargs.get("bar_offset", (0, -32)))
+        self.color = kwargs.get("color", "red")
+        self.line_width = kwargs.get("line_width", 1)
+
+    def _draw(self, surface, offset=None):
+        if offset is None:
+            offset = Vec2()
+        if self.group is None:
+            return
+        width, height = self.size
+        outline, center = PROCEDURAL.get(
+            "bar", width, height, self.color, self.line_width
+        )
+        fill, _ = PROCEDURAL.get("bar", width, height, self.color, 0)
+        dx = self.bar_offset[0] + offset[0] - center[0]
+        dy = self.bar_offset[1] + offset[1] - center[1]
+        view = surface.get_rect()
+        blits = []
+        for obj in self.group:
+            if obj.do_kill or not getattr(obj, "_hp_shown", False):
+                continue
+            x, y = obj.pos[0] + dx, obj.pos[1] + dy
+            if not view.colliderect((x, y, width, height)):
+                continue
+            filled = round(width * max(obj._hp, 0) / obj._hp_max)
+            blits.append((outline, (x, y)))
+            blits.append((fill, (x, y), (0, 0, filled, height)))
+        if blits:
+            surface.blits(blits, doreturn=False)
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+import pygame as pg
+
+from walls import WallGrid
+
+MAGIC = b"JZLV"
+VERSION = 1
+CACHE_DIR = "./.level_cache"
+HEADER = struct.Struct("<4sHHHHHHHHHHqq20s")
+RECT = struct.Struct("<iiii")
+ZONE = struct.Struct("<dddd")
+POSITION = struct.Struct("<32sdd")
+
+
+class Level:
+    """A compiled .tmj, read straight out of a memory-mapped cache file.
+
+    The wall grid and tile layers are memoryviews into the mapping, so loading
+    a level only unpacks the header and the small zone and position tables.
+    They are only valid until close(); walls() and tile_layers() return copies
+    that outlive it.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._view = view = memoryview(buffer)
+        (
+            _magic,
+            _version,
+            width,
+            height,
+            tile_width,
+            tile_height,
+            self.firstgid,
+            layer_count,
+            rect_count,
+            zone_count,
+            position_count,
+            _mtime,
+            _size,
+            _digest,
+        ) = HEADER.unpack_from(buffer)
+        self.map_size = (width, height)
+        self.tile_size = (tile_width, tile_height)
+        tiles = width * height
+        offset = HEADER.size
+
+        self.wall_grid = view[offset : offset + tiles]
+        offset = _align(offset + tiles)
+
+        self.layers = []
+        for _ in range(layer_count):
+            self.layers.append(view[offset : offset + tiles * 4].cast("I"))
+            offset += tiles * 4
+
+        self.wall_rects = []
+        for _ in range(rect_count):
+            self.wall_rects.append(pg.Rect(RECT.unpack_from(buffer, offset)))
+            offset += RECT.size
+
+        self.spawn_zones = []
+        for _ in range(zone_count):
+            x, y, zone_width, zone_height = ZONE.unpack_from(buffer, offset)
+            self.spawn_zones.append(
+                {
+                    "x": x,
+                    "y": y,
+                    "width": zone_width,
+                    "height": zone_height,
+                    "area": zone_width * zone_height,
+                }
+            )
+            offset += ZONE.size
+
+        self.positions = {}
+        for _ in range(position_count):
+            name, x, y = POSITION.unpack_from(buffer, offset)
+            self.positions.setdefault(name.rstrip(b"\0").decode(), (x, y))
+            offset += POSITION.size
+
+    def walls(self):
+        return WallGrid.from_bytes(
+            self.map_size, self.tile_size, bytearray(self.wall_grid)
+        )
+
+    def tile_layers(self):
+        return [array("I", layer.tobytes()) for layer in self.layers]
+
+    def close(self):
+        for layer in self.layers:
+            layer.release()
+        self.wall_grid.release()
+        self._view.release()
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _align(offset, size=4):
+    return offset + (-offset % size)
+
+
+def _digest(path):
+    with open(path, "rb") as source:
+        return hashlib.sha1(source.read()).digest()
+
+
+def compile_level(path):
+    with open(path) as map_json:
+        map_data = json.load(map_json)
+    width, height = map_data["width"], map_data["height"]
+    tile_size = (map_data["tilewidth"], map_data["tileheight"])
+
+    walls = WallGrid((width, height), tile_size)
+    layers = []
+    zones = []
+    positions = []
+    for layer in map_data["layers"]:
+        if layer["type"] == "tilelayer" and layer.get("visible", True):
+            layers.append(array("I", layer["data"]))
+        if layer["name"] == "Walls":
+            for wall in layer["objects"]:
+                walls.block_rect(
+                    pg.Rect(wall["x"], wall["y"], wall["width"], wall["height"])
+                )
+        if layer["name"] == "SpawnZones":
+            for area in layer["objects"]:
+                zones.append((area["x"], area["y"], area["width"], area["height"]))
+        if layer["name"] == "Positions":
+            for position in layer["objects"]:
+                positions.append(
+                    (position["name"].encode(), position["x"], position["y"])
+                )
+    rects = walls.merged_rects()
+
+    stat = os.stat(path)
+    data = bytearray(
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            width,
+            height,
+            tile_size[0],
+            tile_size[1],
+            map_data["tilesets"][0]["firstgid"],
+            len(layers),
+            len(rects),
+            len(zones),
+            len(positions),
+            stat.st_mtime_ns,
+            stat.st_size,
+            _digest(path),
+        )
+    )
+    data += walls.blocked
+    data += bytes(_align(len(data)) - len(data))
+    for layer in layers:
+        data += layer.tobytes()
+    for rect in rects:
+        data += RECT.pack(*rect)
+    for zone in zones:
+        data += ZONE.pack(*zone)
+    for position in positions:
+        data += POSITION.pack(*position)
+    return bytes(data)
+
+
+def cache_path(path, cache_dir=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(path))[0]
+    key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{name}-{key}.lvl")
+
+
+def _is_fresh(cached, path):
+    with open(cached, "rb") as cache_file:
+        header = cache_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return False
+    fields = HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return False
+    stat = os.stat(path)
+    if (fields[11], fields[12]) == (stat.st_mtime_ns, stat.st_size):
+        return True
+    return fields[12] == stat.st_size and fields[13] == _digest(path)
+
+
+def load_level(path, cache_dir=CACHE_DIR):
+    cached = cache_path(path, cache_dir)
+    if not (os.path.exists(cached) and _is_fresh(cached, path)):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Workers loading the same level at once each write their own temp
+        # file, so the one replaced into place is always complete.
+        handle, temp = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(handle, "wb") as cache_file:
+                cache_file.write(compile_level(path))
+            os.replace(temp, cached)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+    with open(cached, "rb") as cache_file:
+        buffer = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return Level(buffer)
+
+
+if __name__ == "__main__":
+    for level_path in sys.argv[1:]:
+        with load_level(level_path) as level:
+            print(
+                f"{level_path} -> {cache_path(level_path)}: {level.map_size[0]}x"
+                f"{level.map_size[1]} tiles, {len(level.wall_rects)} wall rects, "
+                f"{len(level.spawn_zones)} spawn zones, {len(level.positions)} positions"
+            )
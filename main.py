@@ -1,13 +1,30 @@
+import argparse
+import atexit
+
 import pygame as pg
 
 import Jazz
 import Jazz.user_interface as jui
+from replay import ReplayClock, start_recording, start_replay, stop_recording
 from scenes import MainMenu, Test
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", help="record input and the RNG seed to a file")
+    parser.add_argument("--replay", help="play back an input recording")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.replay:
+        recording = start_replay(args.replay).recording
+    elif args.record:
+        start_recording(args.record, args.seed)
+        atexit.register(stop_recording)
+
     app = Jazz.Application(720, 405, flags=Jazz.SCALED | Jazz.DOUBLEBUF)
     SCENES = [Test, MainMenu]
     for scene in SCENES:
         app.add_scene(scene)
     jui.set_default_font(pg.font.SysFont(pg.font.get_fonts()[5], 10))
+    if args.replay:
+        app._clock = ReplayClock(app, recording.frame_ms(), pace=pg.time.Clock())
     app.run()
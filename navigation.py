@@ -0,0 +1,102 @@
+import numpy as np
+
+from Jazz.utils import direction_to
+
+NEIGHBOURS = (
+    (1, 0),
+    (-1, 0),
+    (0, 1),
+    (0, -1),
+    (1, 1),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+)
+
+
+class FlowField:
+    """Breadth-first distance field towards one goal tile, shared by every Chaser.
+
+    The field is only rebuilt when the goal moves to a different tile, and the
+    step out of each tile is worked out the first time a Chaser samples it.
+    The BFS expands a whole frontier at a time over a copy of the grid padded
+    with a blocked border, so neighbours need no bounds checks.
+    """
+
+    UNREACHED = -1
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.goal = None
+        self.distance = np.full(grid.width * grid.height, self.UNREACHED, np.int32)
+        self._steps = {}
+        padded_width = grid.width + 2
+        padded = np.zeros((grid.height + 2, padded_width), dtype=bool)
+        padded[1:-1, 1:-1] = (
+            np.frombuffer(grid.blocked, dtype=np.uint8).reshape(grid.height, grid.width)
+            == 0
+        )
+        self._open = padded.ravel()
+        self._offsets = np.array((-1, 1, -padded_width, padded_width))
+        self.rebuilds = 0
+
+    def update(self, target_pos):
+        goal = self.grid.tile_at(target_pos)
+        if goal == self.goal:
+            return False
+        self.goal = goal
+        self._rebuild()
+        return True
+
+    def _rebuild(self):
+        grid = self.grid
+        width, height = grid.width, grid.height
+        self._steps = {}
+        self.rebuilds += 1
+        goal_x, goal_y = self.goal
+        distance = np.full((height + 2) * (width + 2), self.UNREACHED, np.int32)
+        if grid.is_blocked(goal_x, goal_y):
+            self.distance = distance[: width * height]
+            return
+        unvisited = self._open.copy()
+        start = (goal_y + 1) * (width + 2) + goal_x + 1
+        distance[start] = 0
+        unvisited[start] = False
+        frontier = np.array((start,))
+        step = 0
+        while len(frontier):
+            step += 1
+            neighbours = (frontier[:, None] + self._offsets).ravel()
+            frontier = np.unique(neighbours[unvisited[neighbours]])
+            unvisited[frontier] = False
+            distance[frontier] = step
+        self.distance = distance.reshape(height + 2, width + 2)[1:-1, 1:-1].ravel()
+
+    def _step(self, x, y):
+        grid = self.grid
+        best = None
+        best_distance = self.distance[y * grid.width + x]
+        for dx, dy in NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            if grid.is_blocked(nx, ny):
+                continue
+            if dx and dy and (grid.is_blocked(x + dx, y) or grid.is_blocked(x, y + dy)):
+                continue
+            distance = self.distance[ny * grid.width + nx]
+            if 0 <= distance < best_distance:
+                best = (nx, ny)
+                best_distance = distance
+        return best
+
+    def direction(self, pos, target_pos):
+        x, y = self.grid.tile_at(pos)
+        if (x, y) == self.goal or not self.grid.in_bounds(x, y):
+            return direction_to(pos, target_pos)
+        if self.distance[y * self.grid.width + x] < 0:
+            return direction_to(pos, target_pos)
+        if (x, y) not in self._steps:
+            self._steps[(x, y)] = self._step(x, y)
+        step = self._steps[(x, y)]
+        if step is None:
+            return direction_to(pos, target_pos)
+        return direction_to(pos, self.grid.tile_center(*step))
@@ -6,6 +6,7 @@ from Jazz.global_dict import Game_Globals
 import Jazz.objects as jobj
 import Jazz.user_interface as jui
 from actors import Upgrade
+from atlas import ATLAS
 from Jazz.baseObject import GameObject
 from Jazz.components import AnimatedSprite, Label, ProgressBar, Sprite
 from Jazz.utils import (Vec2, angle_from_vec, clamp, direction_to, dist_to,
@@ -26,7 +27,9 @@ class Player(jobj.Body):
     def __init__(self, **kwargs):
         super().__init__(name="player", size=(16, 16), **kwargs)
         self.add_child(
-            AnimatedSprite(spritesheet=self.IDLE_ANIM, animation_fps=10, pos=(0, -12)),
+            AnimatedSprite(
+                spritesheet=ATLAS.frames(self.IDLE_ANIM), animation_fps=10, pos=(0, -12)
+            ),
             "sprite",
         )
         self.add_child(
@@ -110,7 +113,7 @@ class Player(jobj.Body):
             )
 
         if self._last_state != self._state:
-            self.sprite.update_animation(self.ANIMS[self._state])
+            self.sprite.update_animation(ATLAS.frames(self.ANIMS[self._state]))
             self._last_state = self._state
 
     def apply_upgrade(self, amount, stat):
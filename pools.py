@@ -0,0 +1,102 @@
+from collections import deque
+
+POOLS = []
+
+
+class ObjectPool:
+    """Free lists of reusable objects, keyed by whatever reset() can't change.
+
+    Pooled classes take their constructor arguments again in reset() and call
+    release() from queue_kill. Released objects are held back for two frames
+    so the scene has dropped them before they are handed out again.
+    """
+
+    def __init__(self, factory, cap=512):
+        self.name = factory.__name__
+        self._factory = factory
+        self.cap = cap
+        self._free = {}
+        self._free_count = 0
+        self._frame = 0
+        self.active = 0
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+        POOLS.append(self)
+
+    def acquire(self, key, *args, **kwargs):
+        free = self._free.get(key)
+        if free and free[0][0] < self._frame - 1:
+            _frame, obj = free.popleft()
+            self._free_count -= 1
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self._factory(*args, **kwargs)
+            obj.pool = self
+            obj.pool_key = key
+            self.created += 1
+        self.active += 1
+        return obj
+
+    def prefill(self, key, *args, **kwargs):
+        """Builds one spare object ahead of time and files it as free under key.
+
+        Returns None without building anything once the pool already holds
+        `cap` free objects, the same limit release() keeps to.
+        """
+        if self._free_count >= self.cap:
+            return None
+        obj = self._factory(*args, **kwargs)
+        obj.pool = self
+        obj.pool_key = key
+        self.created += 1
+        self._free.setdefault(key, deque()).append((self._frame - 2, obj))
+        self._free_count += 1
+        return obj
+
+    def free(self, key):
+        return len(self._free.get(key, ()))
+
+    def release(self, obj):
+        self.active -= 1
+        if self._free_count >= self.cap:
+            self.dropped += 1
+            return
+        self._free.setdefault(obj.pool_key, deque()).append((self._frame, obj))
+        self._free_count += 1
+
+    def tick(self):
+        self._frame += 1
+
+    def clear(self):
+        self._free.clear()
+        self._free_count = 0
+        self.active = 0
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "free": self._free_count,
+            "cap": self.cap,
+            "created": self.created,
+            "reused": self.reused,
+            "dropped": self.dropped,
+        }
+
+
+def tick_pools():
+    for pool in POOLS:
+        pool.tick()
+
+
+def clear_pools():
+    for pool in POOLS:
+        pool.clear()
+
+
+def pool_stats():
+    return {pool.name: pool.stats() for pool in POOLS}
@@ -0,0 +1,70 @@
+import pygame as pg
+
+
+class ProceduralSprites:
+    """Surfaces painted by code, built once per set of parameters.
+
+    Register a painter with @PROCEDURAL.painter("name"); get("name", *params)
+    calls it the first time those params are seen and returns the same surface
+    after that, along with the point to centre it on.
+    """
+
+    def __init__(self):
+        self._painters = {}
+        self._cache = {}
+
+    def painter(self, name):
+        def register(paint):
+            self._painters[name] = paint
+            return paint
+
+        return register
+
+    def get(self, name, *params):
+        key = (name, *params)
+        sprite = self._cache.get(key)
+        if sprite is None:
+            image, center = self._painters[name](*params)
+            sprite = (image.convert_alpha(), center)
+            self._cache[key] = sprite
+        return sprite
+
+    def blit(self, surface, pos, name, *params):
+        image, center = self.get(name, *params)
+        surface.blit(image, (pos[0] - center[0], pos[1] - center[1]))
+
+    def clear(self):
+        self._cache.clear()
+
+
+PROCEDURAL = ProceduralSprites()
+
+
+@PROCEDURAL.painter("circle")
+def paint_circle(radius, color):
+    size = int(radius) * 2 + 2
+    center = (size // 2, size // 2)
+    image = pg.Surface((size, size), pg.SRCALPHA)
+    pg.draw.circle(image, color, center, radius)
+    return image, center
+
+
+@PROCEDURAL.painter("target")
+def paint_target(radius):
+    size = int(radius) * 2 + 2
+    center = (size // 2, size // 2)
+    image = pg.Surface((size, size), pg.SRCALPHA)
+    pg.draw.circle(image, "red", center, radius)
+    pg.draw.circle(image, "white", center, radius * 0.66)
+    pg.draw.circle(image, "red", center, radius * 0.33)
+    return image, center
+
+
+@PROCEDURAL.painter("bar")
+def paint_bar(width, height, color, line_width):
+    image = pg.Surface((width, height), pg.SRCALPHA)
+    if line_width:
+        pg.draw.rect(image, color, image.get_rect(), line_width)
+    else:
+        image.fill(color)
+    return image, (width // 2, height // 2)
@@ -0,0 +1,215 @@
+import time
+from collections import defaultdict, deque
+
+import pygame as pg
+
+import Jazz.objects as jobj
+import Jazz.user_interface as jui
+from Jazz.baseObject import GameObject
+
+TRACKED_METHODS = ("update", "_draw")
+TRACKED_PHASES = ((jobj.Body, "move_and_collide", "collisions"),)
+
+
+class Profiler:
+    """Rolling per-frame timings for object classes and named scene phases.
+
+    While enabled, update and _draw are wrapped on every GameObject subclass
+    that defines them, and time is charged to the class of the object being
+    run. Timings are exclusive: a nested timed call is subtracted from the
+    call it happened inside, so the rows add up to the frame.
+
+    Listeners get on_span(label, start, duration) for every phase() and
+    on_frame(totals, calls, bounds) once a frame before the totals are rolled
+    over. bounds maps each key to the [start, end] perf_counter times of its
+    first and last call that frame; the engine's loop interleaves objects of
+    different classes, so these are extents rather than contiguous blocks.
+    """
+
+    def __init__(self, window=120):
+        self.window = window
+        self.enabled = False
+        self.frames = 0
+        self._current = defaultdict(float)
+        self._calls = defaultdict(int)
+        self._bounds = {}
+        self._history = {}
+        self._stack = []
+        self._originals = []
+        self.listeners = []
+
+    def enable(self, enabled=True):
+        if enabled and not self.enabled:
+            self._install()
+        elif not enabled and self.enabled:
+            self._uninstall()
+        self.enabled = enabled
+
+    def toggle(self):
+        self.enable(not self.enabled)
+        return self.enabled
+
+    def _install(self):
+        classes = [GameObject]
+        seen = set()
+        while classes:
+            cls = classes.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            for method in TRACKED_METHODS:
+                if method in cls.__dict__:
+                    self._patch(cls, method, None)
+            classes.extend(cls.__subclasses__())
+        for owner, method, label in TRACKED_PHASES:
+            self._patch(owner, method, label)
+
+    def _patch(self, owner, method, label):
+        original = getattr(owner, method, None)
+        if original is None:
+            return
+        self._originals.append((owner, method, owner.__dict__.get(method)))
+        setattr(owner, method, self._wrap(original, method, label))
+
+    def _uninstall(self):
+        while self._originals:
+            owner, method, original = self._originals.pop()
+            if original is None:
+                delattr(owner, method)
+            else:
+                setattr(owner, method, original)
+        self._stack.clear()
+
+    def _wrap(self, function, method, label):
+        def timed(obj, *args, **kwargs):
+            key = label or f"{type(obj).__name__}.{method}"
+            self._begin()
+            try:
+                return function(obj, *args, **kwargs)
+            finally:
+                self._end(key)
+
+        return timed
+
+    def _begin(self):
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def _end(self, key):
+        if not self._stack:
+            return
+        start, nested = self._stack.pop()
+        now = time.perf_counter()
+        elapsed = now - start
+        self._current[key] += elapsed - nested
+        self._calls[key] += 1
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            self._bounds[key] = [start, now]
+        else:
+            bounds[1] = now
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def phase(self, label, function, *args, **kwargs):
+        """Runs function(*args, **kwargs) and charges its time to label."""
+        if not self.enabled:
+            return function(*args, **kwargs)
+        self._begin()
+        start = self._stack[-1][0]
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._end(label)
+            for listener in self.listeners:
+                listener.on_span(label, start, time.perf_counter() - start)
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.frames += 1
+        for listener in self.listeners:
+            listener.on_frame(self._current, self._calls, self._bounds)
+        for key in self._history.keys() | self._current.keys():
+            history = self._history.get(key)
+            if history is None:
+                history = self._history[key] = deque(maxlen=self.window)
+            history.append((self._current.get(key, 0.0), self._calls.get(key, 0)))
+        self._current.clear()
+        self._calls.clear()
+        self._bounds.clear()
+
+    def stats(self):
+        rows = []
+        for key, history in self._history.items():
+            if not history:
+                continue
+            times = [seconds for seconds, _calls in history]
+            rows.append(
+                {
+                    "name": key,
+                    "avg_ms": sum(times) / len(times) * 1000,
+                    "max_ms": max(times) * 1000,
+                    "calls": history[-1][1],
+                }
+            )
+        rows.sort(key=lambda row: row["avg_ms"], reverse=True)
+        return rows
+
+    def reset(self):
+        self._current.clear()
+        self._calls.clear()
+        self._bounds.clear()
+        self._history.clear()
+        self.frames = 0
+
+
+PROFILER = Profiler()
+
+
+class ProfilerOverlay(GameObject):
+    """Screen-space table of the slowest PROFILER rows, redrawn a few times a second."""
+
+    def __init__(self, name="ProfilerOverlay", **kwargs):
+        kwargs.setdefault("screen_layer", True)
+        super().__init__(name, **kwargs)
+        self.rows = kwargs.get("rows", 14)
+        self.refresh = kwargs.get("refresh", 0.5)
+        self.color = kwargs.get("color", "white")
+        self.panel = None
+        self._timer = 0
+
+    def update(self, delta):
+        if not self.visible:
+            return
+        self._timer -= delta
+        if self._timer > 0:
+            return
+        self._timer = self.refresh
+        stats = PROFILER.stats()
+        lines = [("frame", f"{sum(row['avg_ms'] for row in stats):.2f} ms")]
+        for row in stats[: self.rows]:
+            lines.append(
+                (
+                    row["name"],
+                    f"{row['avg_ms']:.2f} ms  {row['max_ms']:.2f} max  {row['calls']}x",
+                )
+            )
+        self.panel = self._render(lines)
+
+    def _render(self, lines):
+        font = jui.DEFAULT_FONT
+        names = [font.render(name, True, self.color) for name, _value in lines]
+        values = [font.render(value, True, self.color) for _name, value in lines]
+        height = font.get_linesize()
+        column = max(image.get_width() for image in names) + 8
+        width = column + max(image.get_width() for image in values)
+        panel = pg.Surface((width + 8, height * len(lines) + 8), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for index, (name, value) in enumerate(zip(names, values)):
+            panel.blit(name, (4, 4 + index * height))
+            panel.blit(value, (4 + column, 4 + index * height))
+        return panel
+
+    def _draw(self, surface, offset=None):
+        if self.panel is not None:
+            surface.blit(self.panel, (self.pos[0], self.pos[1]))
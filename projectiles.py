@@ -0,0 +1,400 @@
+import random
+from math import cos, radians, sin
+
+import numpy as np
+
+from Jazz.baseObject import GameObject
+from Jazz.utils import Vec2
+from timestep import FixedTimestep
+from transforms import TRANSFORMS
+from weapon import HIT_PARTICLE_POOL
+
+WALL_LAYERS = int("0101", 2)
+BULLET_RADIUS = 2
+TARGET_CELL = 16
+
+
+class ProjectileHit:
+    __slots__ = ("pos", "name")
+
+    def __init__(self):
+        self.pos = Vec2()
+        self.name = "bullet"
+
+
+class Projectiles(GameObject):
+    """Every live bullet in the scene, stored column-wise and stepped together.
+
+    Weapons call spawn() instead of adding Bullet bodies. The columns are
+    NumPy arrays with the live bullets packed at the front, so moving,
+    ageing and culling them are array operations. Bullets move on a fixed
+    timestep and are drawn interpolated between their last two steps.
+
+    Each step runs a vectorised broad phase: the tiles under a bullet's path
+    are looked up in the wall grid, and its end point in a coarse grid of
+    cells near targets. Only the few bullets it flags are swept exactly
+    against walls and the members of target_groups, in Python, and only the
+    first thing on the path is hit.
+    """
+
+    def __init__(self, name="projectiles", **kwargs):
+        super().__init__(name, **kwargs)
+        self.target_groups = kwargs.get("target_groups", [])
+        self.timestep = FixedTimestep(kwargs.get("step", 1 / 60))
+        self.count = 0
+        capacity = kwargs.get("capacity", 256)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.px = np.zeros(capacity)
+        self.py = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.mask = np.zeros(capacity, dtype=np.int64)
+        self.frames = np.empty(capacity, dtype=object)
+        self.sources = np.empty(capacity, dtype=object)
+        self._hit = ProjectileHit()
+        self._layer_masks = {}
+        self._walls = None
+        self._wall_grid = None
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, pos, direction, speed, damage, layers, frames, source, life=2):
+        self._append(
+            pos[0],
+            pos[1],
+            direction[0],
+            direction[1],
+            speed,
+            damage,
+            life,
+            self._mask(layers),
+            frames,
+            source,
+        )
+
+    def spawn_volley(
+        self,
+        pos,
+        angle,
+        spread,
+        count,
+        speed,
+        speed_jitter,
+        damage,
+        layers,
+        frames,
+        source,
+        life=2,
+    ):
+        """Spawns count bullets fanned randomly over spread degrees around angle.
+
+        Each bullet's speed is scaled by a random factor in [1 - speed_jitter, 1].
+        Headings are worked out as plain floats, so a Shotgun volley is one
+        call with no temporary vectors per pellet.
+        """
+        x, y = pos[0], pos[1]
+        mask = self._mask(layers)
+        base = radians(angle)
+        half = spread / 2
+        for _ in range(count):
+            heading = base
+            if spread > 0:
+                heading += radians(random.uniform(-half, half))
+            shot_speed = speed
+            if speed_jitter:
+                shot_speed = speed * random.uniform(1 - speed_jitter, 1)
+            self._append(
+                x,
+                y,
+                cos(heading),
+                sin(heading),
+                shot_speed,
+                damage,
+                life,
+                mask,
+                frames,
+                source,
+            )
+
+    def _append(self, x, y, dx, dy, speed, damage, life, mask, frames, source):
+        i = self.count
+        if i == len(self.x):
+            self._grow()
+        self.x[i] = x
+        self.y[i] = y
+        self.px[i] = x
+        self.py[i] = y
+        self.dx[i] = dx
+        self.dy[i] = dy
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.life[i] = life
+        self.age[i] = 0
+        self.mask[i] = mask
+        self.frames[i] = frames
+        self.sources[i] = source
+        self.count = i + 1
+
+    def _grow(self):
+        for name in self._column_names():
+            column = getattr(self, name)
+            grown = np.empty(len(column) * 2, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def clear(self):
+        self.frames[: self.count] = None
+        self.sources[: self.count] = None
+        self.count = 0
+
+    def _mask(self, layers):
+        mask = self._layer_masks.get(layers)
+        if mask is None:
+            mask = int(layers, 2)
+            self._layer_masks[layers] = mask
+        return mask
+
+    @staticmethod
+    def _column_names():
+        return (
+            "x",
+            "y",
+            "px",
+            "py",
+            "dx",
+            "dy",
+            "speed",
+            "damage",
+            "life",
+            "age",
+            "mask",
+            "frames",
+            "sources",
+        )
+
+    def _keep(self, keep):
+        """Packs the bullets where keep is True to the front, in order."""
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        for name in self._column_names():
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.frames[kept:n] = None
+        self.sources[kept:n] = None
+        self.count = kept
+
+    def update(self, delta):
+        for _ in range(self.timestep.advance(delta)):
+            if not self.count:
+                break
+            self._step(self.timestep.step)
+
+    def _step(self, delta):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        self.px[:n] = x
+        self.py[:n] = y
+        travel = self.speed[:n] * delta
+        x += self.dx[:n] * travel
+        y += self.dy[:n] * travel
+        life = self.life[:n]
+        life -= delta
+        self.age[:n] += delta
+
+        walls = self.scene.map.walls
+        alive = life > 0
+        near_walls = alive & self._near_walls(walls, n)
+        target_hits = self._target_hits(walls, n, alive, float(travel.max()))
+
+        candidates = set(np.flatnonzero(near_walls).tolist())
+        candidates.update(target_hits)
+        hit = np.zeros(n, dtype=bool)
+        for i in sorted(candidates, reverse=True):
+            first, target = target_hits.get(i, (None, None))
+            if self._resolve(i, walls, first, target, near_walls[i]):
+                self.scene.add_object(
+                    HIT_PARTICLE_POOL.acquire("hit", pos=Vec2(x[i], y[i]))
+                )
+                hit[i] = True
+        keep = alive & ~hit
+        if not keep.all():
+            self._keep(keep)
+
+    def _near_walls(self, walls, n):
+        """Bullets whose path this step touches a wall tile or leaves the map."""
+        if walls is not self._walls:
+            self._walls = walls
+            self._wall_grid = np.frombuffer(walls.blocked, dtype=np.uint8).reshape(
+                walls.height, walls.width
+            )
+        grid = self._wall_grid
+        tw, th = walls.tile_width, walls.tile_height
+        x0 = np.floor_divide(self.px[:n], tw).astype(np.intp)
+        y0 = np.floor_divide(self.py[:n], th).astype(np.intp)
+        x1 = np.floor_divide(self.x[:n], tw).astype(np.intp)
+        y1 = np.floor_divide(self.y[:n], th).astype(np.intp)
+        outside = (
+            (np.minimum(x0, x1) < 0)
+            | (np.maximum(x0, x1) >= walls.width)
+            | (np.minimum(y0, y1) < 0)
+            | (np.maximum(y0, y1) >= walls.height)
+        )
+        # A path shorter than a tile only crosses the tiles in the box
+        # spanned by its two ends; longer ones always go to the exact raycast.
+        long = (np.abs(x1 - x0) > 1) | (np.abs(y1 - y0) > 1)
+        np.clip(x0, 0, walls.width - 1, out=x0)
+        np.clip(x1, 0, walls.width - 1, out=x1)
+        np.clip(y0, 0, walls.height - 1, out=y0)
+        np.clip(y1, 0, walls.height - 1, out=y1)
+        blocked = grid[y0, x0] | grid[y1, x1] | grid[y0, x1] | grid[y1, x0]
+        return ((self.mask[:n] & WALL_LAYERS) != 0) & ((blocked != 0) | outside | long)
+
+    def _target_hits(self, walls, n, alive, max_travel):
+        """First target each bullet's path hits this step, as {index: (fraction, target)}.
+
+        Targets are binned into TARGET_CELL cells around their reach, every
+        bullet is paired with the targets binned in its end cell, and the
+        pairs are swept all at once.
+        """
+        targets, tx, ty, reach, layers = [], [], [], [], []
+        for group in self.target_groups:
+            for obj in group:
+                if obj.do_kill:
+                    continue
+                targets.append(obj)
+                tx.append(obj.pos[0])
+                ty.append(obj.pos[1])
+                reach.append(getattr(obj, "_radius", 8) + BULLET_RADIUS)
+                layers.append(self._mask(obj._layers))
+        if not targets:
+            return {}
+        tx, ty = np.array(tx), np.array(ty)
+        reach, layers = np.array(reach), np.array(layers, dtype=np.int64)
+
+        columns = -(-walls.width * walls.tile_width // TARGET_CELL) + 1
+        rows = -(-walls.height * walls.tile_height // TARGET_CELL) + 1
+        box = reach + max_travel
+        cx0 = np.clip((tx - box) // TARGET_CELL, 0, columns - 1).astype(np.intp)
+        cx1 = np.clip((tx + box) // TARGET_CELL, 0, columns - 1).astype(np.intp)
+        cy0 = np.clip((ty - box) // TARGET_CELL, 0, rows - 1).astype(np.intp)
+        cy1 = np.clip((ty + box) // TARGET_CELL, 0, rows - 1).astype(np.intp)
+        entry_cells, entry_targets = [], []
+        for t, (x0, x1, y0, y1) in enumerate(
+            zip(cx0.tolist(), cx1.tolist(), cy0.tolist(), cy1.tolist())
+        ):
+            for cy in range(y0, y1 + 1):
+                entry_cells.extend(range(cy * columns + x0, cy * columns + x1 + 1))
+            entry_targets.extend([t] * ((x1 - x0 + 1) * (y1 - y0 + 1)))
+        entry_cells = np.array(entry_cells, dtype=np.intp)
+        order = np.argsort(entry_cells, kind="stable")
+        entry_cells = entry_cells[order]
+        entry_targets = np.array(entry_targets, dtype=np.intp)[order]
+
+        x1, y1 = self.x[:n], self.y[:n]
+        cells = np.clip(x1 // TARGET_CELL, 0, columns - 1).astype(np.intp)
+        cells += np.clip(y1 // TARGET_CELL, 0, rows - 1).astype(np.intp) * columns
+        start = np.searchsorted(entry_cells, cells, "left")
+        counts = np.searchsorted(entry_cells, cells, "right") - start
+        counts[~alive] = 0
+        total = int(counts.sum())
+        if not total:
+            return {}
+        bullet = np.repeat(np.arange(n), counts)
+        entry = np.arange(total) + np.repeat(
+            start - (np.cumsum(counts) - counts), counts
+        )
+        target = entry_targets[entry]
+        layered = (layers[target] & self.mask[bullet]) != 0
+        bullet, target = bullet[layered], target[layered]
+
+        # segment_circle over every pair at once.
+        x0, y0 = self.px[bullet], self.py[bullet]
+        fx, fy = x0 - tx[target], y0 - ty[target]
+        dx, dy = x1[bullet] - x0, y1[bullet] - y0
+        c = fx * fx + fy * fy - reach[target] ** 2
+        a = dx * dx + dy * dy
+        b = fx * dx + fy * dy
+        discriminant = b * b - a * c
+        moving = (a > 0) & (b < 0) & (discriminant >= 0)
+        fraction = np.zeros(len(bullet))
+        fraction[moving] = (-b[moving] - np.sqrt(discriminant[moving])) / a[moving]
+        touched = (c <= 0) | (moving & (fraction <= 1))
+        fraction[c <= 0] = 0.0
+        if not touched.any():
+            return {}
+        bullet, target, fraction = bullet[touched], target[touched], fraction[touched]
+
+        order = np.lexsort((fraction, bullet))
+        bullet, target, fraction = bullet[order], target[order], fraction[order]
+        first = np.ones(len(bullet), dtype=bool)
+        first[1:] = bullet[1:] != bullet[:-1]
+        return {
+            i: (f, targets[t])
+            for i, t, f in zip(
+                bullet[first].tolist(), target[first].tolist(), fraction[first].tolist()
+            )
+        }
+
+    def _resolve(self, i, walls, first, target, near_wall):
+        x0, y0 = float(self.px[i]), float(self.py[i])
+        x1, y1 = float(self.x[i]), float(self.y[i])
+        if near_wall:
+            hit = walls.raycast((x0, y0), (x1, y1))
+            if hit is not None and (first is None or hit[0] < first):
+                first, target = hit[0], None
+        if first is None:
+            return False
+        self.x[i] = x0 + (x1 - x0) * first
+        self.y[i] = y0 + (y1 - y0) * first
+        if target is not None:
+            damage = float(self.damage[i])
+            self._hit.pos.update(self.x[i], self.y[i])
+            if hasattr(target, "take_damage"):
+                target.take_damage(damage, self.sources[i])
+            if hasattr(target, "knockback"):
+                target.knockback(damage, self._hit)
+        return True
+
+    def _draw(self, surface, offset=None):
+        if offset is None:
+            offset = Vec2()
+        n = self.count
+        if not n:
+            return
+        view = surface.get_rect()
+        ox, oy = offset
+        alpha = self.timestep.alpha
+        last_x, last_y = self.px[:n], self.py[:n]
+        sx = last_x + (self.x[:n] - last_x) * alpha + ox
+        sy = last_y + (self.y[:n] - last_y) * alpha + oy
+        visible = np.flatnonzero(
+            (sx >= view.left)
+            & (sx < view.right)
+            & (sy >= view.top)
+            & (sy < view.bottom)
+        )
+        if not len(visible):
+            return
+        angles = np.degrees(np.arctan2(-self.dy[visible], self.dx[visible])).tolist()
+        ticks = (self.age[visible] * 10).astype(np.intp).tolist()
+        frames = self.frames
+        blits = []
+        for i, angle, tick, px, py in zip(
+            visible.tolist(),
+            angles,
+            ticks,
+            sx[visible].tolist(),
+            sy[visible].tolist(),
+        ):
+            sheet = frames[i]
+            image = TRANSFORMS.get(sheet[tick % len(sheet)], angle=angle)
+            blits.append(
+                (image, (px - image.get_width() / 2, py - image.get_height() / 2))
+            )
+        surface.blits(blits, doreturn=False)
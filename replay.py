@@ -0,0 +1,226 @@
+import random
+import struct
+import time
+
+from Jazz.global_dict import Game_Globals
+from Jazz.utils import Vec2
+
+MAGIC = b"JZIN"
+VERSION = 2
+HEADER = struct.Struct("<4sHQI")
+FRAME = struct.Struct("<HHHBBhhdd")
+KEYS = ("w", "a", "s", "d", "up", "down", "left", "right", "tab", "/", "escape")
+BUTTONS = 3
+
+
+def _bits(test, names):
+    bits = 0
+    for index, name in enumerate(names):
+        if test(name):
+            bits |= 1 << index
+    return bits
+
+
+class InputRecorder:
+    """Writes the Input state seen by the Test scene to a file, one record a frame.
+
+    Each frame stores the frame time in ms, held and pressed bits for KEYS
+    and the first mouse buttons, and the mouse screen and world positions.
+    """
+
+    def __init__(self, path, seed):
+        self.seed = seed
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, seed, 0))
+
+    def capture(self, source, delta):
+        key, mouse = source.key, source.mouse
+        self._file.write(
+            FRAME.pack(
+                min(round(delta * 1000), 0xFFFF),
+                _bits(key.held, KEYS),
+                _bits(key.press, KEYS),
+                _bits(mouse.held, range(BUTTONS)),
+                _bits(mouse.press, range(BUTTONS)),
+                int(mouse.pos[0]),
+                int(mouse.pos[1]),
+                mouse.global_pos[0],
+                mouse.global_pos[1],
+            )
+        )
+        self.frames += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.frames))
+        self._file.close()
+        self._file = None
+
+
+class Recording:
+    def __init__(self, path):
+        with open(path, "rb") as source:
+            data = source.read()
+        magic, version, self.seed, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+        count = min(count or len(data), (len(data) - HEADER.size) // FRAME.size)
+        self.frames = [
+            FRAME.unpack_from(data, HEADER.size + index * FRAME.size)
+            for index in range(count)
+        ]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame_ms(self):
+        return [frame[0] for frame in self.frames]
+
+
+class KeyState:
+    def __init__(self, names):
+        self._index = {name: 1 << index for index, name in enumerate(names)}
+        self.down = 0
+        self.pressed = 0
+        self.released = 0
+
+    def set(self, down, pressed):
+        self.released = self.down & ~down
+        self.down = down
+        self.pressed = pressed
+
+    def held(self, name):
+        return bool(self.down & self._index.get(name, 0))
+
+    def press(self, name):
+        return bool(self.pressed & self._index.get(name, 0))
+
+    def release(self, name):
+        return bool(self.released & self._index.get(name, 0))
+
+
+class MouseState(KeyState):
+    def __init__(self):
+        super().__init__(range(BUTTONS))
+        self.pos = Vec2()
+        self.global_pos = Vec2()
+
+
+class ReplayInput:
+    """Input provider that plays a Recording back, one frame per advance()."""
+
+    def __init__(self, recording):
+        self.recording = recording
+        self.frame = 0
+        self.key = KeyState(KEYS)
+        self.mouse = MouseState()
+
+    def update(self, *args, **kwargs):
+        pass
+
+    def advance(self):
+        if self.frame >= len(self.recording):
+            self.key.set(0, 0)
+            self.mouse.set(0, 0)
+            return False
+        (
+            _ms,
+            held,
+            pressed,
+            mouse_held,
+            mouse_pressed,
+            x,
+            y,
+            world_x,
+            world_y,
+        ) = self.recording.frames[self.frame]
+        self.key.set(held, pressed)
+        self.mouse.set(mouse_held, mouse_pressed)
+        self.mouse.pos = Vec2(x, y)
+        self.mouse.global_pos = Vec2(world_x, world_y)
+        self.frame += 1
+        return True
+
+
+class ReplayClock:
+    """Stands in for the app's pygame Clock and hands it the recorded frame times.
+
+    With `pace` (a pygame Clock) the replay also waits like the game would, so
+    it can be watched in a window; without it, frames run back to back.
+    """
+
+    def __init__(self, app, frame_ms, pace=None):
+        self.app = app
+        self.frame_ms = frame_ms
+        self.pace = pace
+        self.frame = 0
+        self.started = time.perf_counter()
+
+    def tick(self, framerate=0):
+        if self.frame >= len(self.frame_ms):
+            self.app.stop()
+        elif self.pace is not None:
+            self.pace.tick(framerate)
+        self.frame += 1
+        return self.get_time()
+
+    tick_busy_loop = tick
+
+    @property
+    def delta(self):
+        return sum(self.frame_ms) / max(len(self.frame_ms), 1) / 1000
+
+    def get_time(self):
+        if not self.frame_ms:
+            return 0
+        return self.frame_ms[min(max(self.frame - 1, 0), len(self.frame_ms) - 1)]
+
+    get_rawtime = get_time
+
+    def get_fps(self):
+        if self.pace is not None:
+            return self.pace.get_fps()
+        return 1000 / max(self.get_time(), 1)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+RECORDER = None
+REPLAY = None
+
+
+def start_recording(path, seed=None):
+    global RECORDER
+    if seed is None:
+        seed = random.randrange(2**63)
+    random.seed(seed)
+    RECORDER = InputRecorder(path, seed)
+    return RECORDER
+
+
+def stop_recording():
+    global RECORDER
+    if RECORDER is not None:
+        RECORDER.close()
+        RECORDER = None
+
+
+def start_replay(path):
+    global REPLAY
+    recording = Recording(path)
+    random.seed(recording.seed)
+    REPLAY = ReplayInput(recording)
+    return REPLAY
+
+
+def input_frame(delta):
+    """Called by the Test scene at the start of its update, once a frame."""
+    if REPLAY is not None:
+        REPLAY.advance()
+        Game_Globals["Input"] = REPLAY
+    elif RECORDER is not None:
+        RECORDER.capture(Game_Globals["Input"], delta)
@@ -3,15 +3,25 @@ import random
 import pygame
 
 import Jazz
-import Jazz.colliders as jcol
-import Jazz.objects as jobj
 import Jazz.user_interface as jui
 from actors import UI, Map, PauseMenu, Upgrade, WeaponPickup
-from enemies import Chaser, Target, Tower
+from atlas import build_atlas
+from enemy_factory import EnemyFactory
 from Jazz.components import Label, ProgressBar, Sprite
 from Jazz.global_dict import Game_Globals
-from Jazz.utils import dist_to
+from hud import HealthBars, OnChange
+from navigation import FlowField
 from player import Player
+from pools import clear_pools, tick_pools
+from profiler import PROFILER, ProfilerOverlay
+from projectiles import Projectiles
+from replay import input_frame
+from scheduler import AIScheduler
+from sensing import TargetSensor
+from spatial import SpatialHash
+from spawning import SpawnIndex
+from tracing import trace_from_env, tracing
+from weapon import warm_weapon_sprites
 
 
 class MainMenu(Jazz.Scene):
@@ -36,22 +46,30 @@ class Test(Jazz.Scene):
         self.enemy_timer = 0
 
         pygame.mouse.set_visible(False)
+        trace_from_env()
+        clear_pools()
 
-        self.make_sprite_sheet("./Assets/Bullet.png", (7, 7))
-        self.make_sprite_sheet("./Assets/enemy_bullet.png", (8, 8))
+        build_atlas()
+        warm_weapon_sprites()
 
         self.add_group("enemies")
         self.add_group("_player")
         self.add_group("level_upgrade")
         self.add_group("level_weapons")
+        self.enemy_hash = SpatialHash(cell_size=32)
+        self.ai_scheduler = AIScheduler()
+        self.sensor = TargetSensor()
+        self.enemy_factory = EnemyFactory(self)
 
         self.add_object(Map(visible=True, z=-1), "map")
-        spawn_checker = jobj.Body(pos=(0, 0), layers="0000", collision_layers="1111")
-        spawn_checker.add_child(jcol.CircleCollider(32), "collider")
+        self.flow_field = FlowField(self.map.walls)
         self.add_object(
-            spawn_checker,
-            "spawn_checker",
+            Projectiles(target_groups=[self["enemies"], self["_player"]]),
+            "projectiles",
         )
+        self.add_object(HealthBars(group=self["enemies"], z=5), "health_bars")
+        self.spawn_index = SpawnIndex(self.map.spawn_zones, self.map.walls)
+        self.deferred_spawns = []
         self.add_object(
             Player(
                 pos=self.map.positions["player_spawn"],
@@ -100,6 +118,9 @@ class Test(Jazz.Scene):
             ),
             "ammo_bar",
         )
+        self.shown_hp = OnChange(self.hp_bar.update_value)
+        self.shown_ammo = OnChange(self.ammo_bar.update_value)
+        self.caption = OnChange(pygame.display.set_caption)
 
         self.add_object(
             Label(
@@ -145,11 +166,16 @@ class Test(Jazz.Scene):
             ),
             "cursor",
         )
+        self.add_object(
+            ProfilerOverlay(pos=(40, 4), z=20, visible=self.camera.debug),
+            "profiler_overlay",
+        )
 
         self.camera.set_bg_color((64, 64, 64))
         self.camera.set_target(self.player)
         self.camera.set_offset(self.player.pos)
-        self.camera.set_bounds((0, 0, 1600 - self.width, 1600 - self.height))
+        map_width, map_height = self.map.pixel_size
+        self.camera.set_bounds((0, 0, map_width - self.width, map_height - self.height))
         self.camera.follow_type = self.camera.SMOOTH
 
         self.spawn_weapons()
@@ -160,45 +186,23 @@ class Test(Jazz.Scene):
         spawners = [self.spawn_target, self.spawn_tower, self.spawn_chaser]
         for _ in range(amount):
             enemy_type = random.randint(0, len(spawners) - 1)
-            spawners[enemy_type]()
+            self.spawn_at_valid_point(spawners[enemy_type])
 
-    def spawn_target(self):
-        self.add_object(
-            Target(
-                random.randint(5, 16),
-                hp_max=self.difficulty * 10,
-                pos=self.get_valid_spawn(),
-                groups=[self["enemies"]],
-            )
-        )
+    def spawn_at_valid_point(self, spawner):
+        pos = self.get_valid_spawn()
+        if pos is None:
+            self.deferred_spawns.append(spawner)
+        else:
+            spawner(pos)
 
-    def spawn_tower(self):
-        self.add_object(
-            Tower(
-                pos=self.get_valid_spawn(),
-                hp_max=self.difficulty * 15,
-                damage=self.difficulty + 3,
-                rof=self.difficulty + 1.5,
-                range=150 + 10 * self.difficulty,
-                burst=3 + self.difficulty,
-                burst_timer=max(2 - self.difficulty * 0.2, 0.5),
-                target_group=self["_player"],
-                groups=[self["enemies"]],
-            )
-        )
+    def spawn_target(self, pos):
+        self.enemy_factory.spawn("target", pos)
 
-    def spawn_chaser(self):
-        self.add_object(
-            Chaser(
-                pos=self.get_valid_spawn(),
-                hp_max=self.difficulty * 20,
-                damage=self.difficulty * 5,
-                speed=self.difficulty * 25 + 100,
-                target_group=self["_player"],
-                friend_group=self["enemies"],
-                groups=[self["enemies"]],
-            )
-        )
+    def spawn_tower(self, pos):
+        self.enemy_factory.spawn("tower", pos)
+
+    def spawn_chaser(self, pos):
+        self.enemy_factory.spawn("chaser", pos)
 
     def spawn_upgrades(self):
         pos = self.map.positions["upgrade_spawn"]
@@ -230,19 +234,7 @@ class Test(Jazz.Scene):
         self.upgrade_phase = True
 
     def get_valid_spawn(self):
-        spawn_pos = None
-        while spawn_pos is None:
-            spawn_pos = self.map.get_spawn_point()
-            if spawn_pos is None:
-                continue
-            if dist_to(spawn_pos, self.player.pos) > 72:
-                self.spawn_checker.pos = spawn_pos
-                collisions = self.get_AABB_collisions(self.spawn_checker)
-                if collisions:
-                    spawn_pos = None
-            else:
-                spawn_pos = None
-        return spawn_pos
+        return self.spawn_index.pick(self["enemies"], self.player.pos)
 
     def state_logic(self, delta):
         if self.game_over:
@@ -279,19 +271,30 @@ class Test(Jazz.Scene):
                 self.wave_label.visible = True
                 self.wave_label.set_text(str(self.wave))
                 self.wave_count = int(self.difficulty * 10)
-                self.spawn_enemies(5)
+                PROFILER.phase("spawn_enemies", self.spawn_enemies, 5)
                 self.wave_count -= 5
                 self.upgrade_phase = False
             elif self.wave_timer > 0:
                 self.card.update_timer(self.wave_timer)
                 self.wave_timer -= delta
+            self.enemy_factory.warm(self.difficulty)
         else:
-            if not self["enemies"] and self.wave_count <= 0:
+            if self.deferred_spawns:
+                deferred, self.deferred_spawns = self.deferred_spawns, []
+                for spawner in deferred:
+                    self.spawn_at_valid_point(spawner)
+            if (
+                not self["enemies"]
+                and not self.deferred_spawns
+                and self.wave_count <= 0
+            ):
                 self.card.show_card()
                 self.difficulty += 0.5
                 self.spawn_upgrades()
             elif self.enemy_timer <= 0 and self.wave_count > 0:
-                self.spawn_enemies(1 + int(self.difficulty // 2))
+                PROFILER.phase(
+                    "spawn_enemies", self.spawn_enemies, 1 + int(self.difficulty // 2)
+                )
                 self.wave_count -= 1 + int(self.difficulty // 2)
                 self.enemy_timer = max(1.5 - self.difficulty * 0.05, 0.5)
             else:
@@ -303,15 +306,29 @@ class Test(Jazz.Scene):
 
     def toggle_debug(self):
         self.camera.debug = not self.camera.debug
+        self.profiler_overlay.visible = self.camera.debug
+        PROFILER.enable(self.camera.debug or tracing())
 
     def update_ui(self):
-        pygame.display.set_caption(str(self.app._clock.get_fps()))
-        # pygame.display.set_caption(str(self.app._clock.get_fps()))
+        self.caption.set(str(round(self.app._clock.get_fps())))
         if not self.game_over:
-            self.hp_bar.update_value(self.player._hp)
-            self.ammo_bar.update_value(self.player.weapon._ammo)
+            self.shown_hp.set(self.player._hp)
+            self.shown_ammo.set(self.player.weapon._ammo)
 
     def update(self, delta):
+        input_frame(delta)
+        PROFILER.end_frame()
+        tick_pools()
+        PROFILER.phase("enemy_hash", self.enemy_hash.rebuild, self["enemies"])
+        PROFILER.phase("sensing", self.sensor.update, self["enemies"])
+        if self["_player"]:
+            PROFILER.phase("flow_field", self.flow_field.update, self.player.pos)
+            self.ai_scheduler.begin_frame(
+                self.player.pos, (self.width, self.height), self.map.pixel_size
+            )
+        else:
+            self.ai_scheduler.begin_frame(None, None, None)
+        self.spawn_index.invalidate()
         self.cursor.pos = Game_Globals["Input"].mouse.pos
 
         if Game_Globals["Input"].key.press("tab"):
@@ -324,9 +341,9 @@ class Test(Jazz.Scene):
         if not self["_player"]:
             self.game_over = True
 
-        self.state_logic(delta)
+        PROFILER.phase("state_logic", self.state_logic, delta)
 
-        self.update_ui()
+        PROFILER.phase("update_ui", self.update_ui)
 
     def on_unload(self):
         for key, value in self.__dict__.items():
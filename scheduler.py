@@ -0,0 +1,61 @@
+from Jazz.utils import clamp
+
+
+class AIScheduler:
+    """Runs the AI of far-away, idle enemies every `interval` frames.
+
+    Enemies that are awake (attacking or aggro'd) or inside the camera view
+    plus `margin` tick every frame. The rest are spread round-robin over
+    `interval` frames by a slot handed out on their first tick, and get the
+    delta accumulated since their last tick when their turn comes.
+    """
+
+    def __init__(self, interval=4, margin=64):
+        self.interval = interval
+        self.margin = margin
+        self.frame = 0
+        self.view = None
+        self.ticked = 0
+        self.skipped = 0
+        self._next_slot = 0
+
+    def begin_frame(self, focus, screen_size, world_size):
+        self.frame += 1
+        if focus is None:
+            self.view = None
+            return
+        width, height = screen_size
+        left = clamp(focus[0] - width / 2, 0, max(world_size[0] - width, 0))
+        top = clamp(focus[1] - height / 2, 0, max(world_size[1] - height, 0))
+        self.view = (
+            left - self.margin,
+            top - self.margin,
+            left + width + self.margin,
+            top + height + self.margin,
+        )
+
+    def near(self, pos):
+        if self.view is None:
+            return True
+        left, top, right, bottom = self.view
+        return left <= pos[0] <= right and top <= pos[1] <= bottom
+
+    def elapsed(self, enemy, delta):
+        """Returns the delta to run enemy's AI with this frame, or None to skip it."""
+        enemy._ai_elapsed += delta
+        if enemy._ai_slot is None:
+            enemy._ai_slot = self._next_slot
+            self._next_slot += 1
+        if (
+            enemy.awake()
+            or self.near(enemy.pos)
+            or (self.frame + enemy._ai_slot) % self.interval == 0
+        ):
+            elapsed, enemy._ai_elapsed = enemy._ai_elapsed, 0.0
+            self.ticked += 1
+            return elapsed
+        self.skipped += 1
+        return None
+
+    def stats(self):
+        return {"ticked": self.ticked, "skipped": self.skipped}
@@ -0,0 +1,92 @@
+from math import sqrt
+
+
+class SpatialHash:
+    """Uniform grid of circles, rebuilt from scratch once per frame."""
+
+    def __init__(self, cell_size=32):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._max_radius = 0
+
+    def __len__(self):
+        return sum(len(cell) for cell in self._cells.values())
+
+    def clear(self):
+        self._cells.clear()
+        self._max_radius = 0
+
+    def insert(self, obj, pos, radius):
+        key = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        self._cells.setdefault(key, []).append((obj, pos[0], pos[1], radius))
+        if radius > self._max_radius:
+            self._max_radius = radius
+
+    def rebuild(self, objects, default_radius=8):
+        self.clear()
+        self.add(objects, default_radius)
+
+    def add(self, objects, default_radius=8):
+        for obj in objects:
+            if obj.do_kill:
+                continue
+            self.insert(obj, obj.pos, getattr(obj, "_radius", default_radius))
+
+    def cells_near(self, pos, radius):
+        reach = radius + self._max_radius
+        size = self.cell_size
+        x0, x1 = int((pos[0] - reach) // size), int((pos[0] + reach) // size)
+        y0, y1 = int((pos[1] - reach) // size), int((pos[1] + reach) // size)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell:
+                    yield cell
+
+    def sweep(self, start, end, radius, exclude=None, accept=None):
+        """Returns (fraction, obj) for the first circle hit by a moving circle, or None."""
+        half = ((end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2) ** 0.5 / 2
+        middle = ((start[0] + end[0]) / 2, (start[1] + end[1]) / 2)
+        first = None
+        for cell in self.cells_near(middle, half + radius):
+            for obj, ox, oy, obj_radius in cell:
+                if obj is exclude or (accept is not None and not accept(obj)):
+                    continue
+                fraction = segment_circle(
+                    start[0], start[1], end[0], end[1], ox, oy, radius + obj_radius
+                )
+                if fraction is not None and (first is None or fraction < first[0]):
+                    first = (fraction, obj)
+        return first
+
+    def query(self, pos, radius, exclude=None):
+        x, y = pos[0], pos[1]
+        found = []
+        for cell in self.cells_near(pos, radius):
+            for obj, ox, oy, obj_radius in cell:
+                if obj is exclude:
+                    continue
+                reach = radius + obj_radius
+                if (ox - x) ** 2 + (oy - y) ** 2 <= reach * reach:
+                    found.append(obj)
+        return found
+
+
+def segment_circle(x0, y0, x1, y1, cx, cy, radius):
+    """Fraction along (x0, y0)-(x1, y1) where it first touches the circle, or None."""
+    fx, fy = x0 - cx, y0 - cy
+    c = fx * fx + fy * fy - radius * radius
+    if c <= 0:
+        return 0.0
+    dx, dy = x1 - x0, y1 - y0
+    a = dx * dx + dy * dy
+    if a == 0:
+        return None
+    b = fx * dx + fy * dy
+    if b >= 0:
+        return None
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+    fraction = (-b - sqrt(discriminant)) / a
+    return fraction if fraction <= 1 else None
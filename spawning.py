@@ -0,0 +1,83 @@
+import random
+
+
+class SpawnIndex:
+    """Grid of spawn cells inside the map's SpawnZones.
+
+    Cells touching a wall are dropped once at load. The cells covered by
+    enemies are worked out at most once a frame, and only on frames that
+    actually spawn, so pick() costs the same however crowded the map is.
+    """
+
+    def __init__(self, spawn_zones, walls, cell_size=32, clearance=32):
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.cells = {}
+        for zone in spawn_zones:
+            x0 = int(zone["x"] // cell_size)
+            y0 = int(zone["y"] // cell_size)
+            x1 = int((zone["x"] + zone["width"]) // cell_size)
+            y1 = int((zone["y"] + zone["height"]) // cell_size)
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    x, y = (cx + 0.5) * cell_size, (cy + 0.5) * cell_size
+                    if not _inside(zone, x, y) or walls.circle_blocked(x, y, clearance):
+                        continue
+                    self.cells[(cx, cy)] = (x, y)
+        self._free = None
+        self.deferred = 0
+
+    def invalidate(self):
+        self._free = None
+
+    def _occupied(self, occupants):
+        size = self.cell_size
+        occupied = set()
+        for obj in occupants:
+            if obj.do_kill:
+                continue
+            reach = self.clearance + getattr(obj, "_radius", 8)
+            x, y = obj.pos
+            for cy in range(int((y - reach) // size), int((y + reach) // size) + 1):
+                for cx in range(int((x - reach) // size), int((x + reach) // size) + 1):
+                    center = self.cells.get((cx, cy))
+                    if center is None:
+                        continue
+                    if (center[0] - x) ** 2 + (center[1] - y) ** 2 < reach * reach:
+                        occupied.add((cx, cy))
+        return occupied
+
+    def pick(self, occupants, avoid_pos, avoid_distance=72):
+        if self._free is None:
+            occupied = self._occupied(occupants)
+            limit = avoid_distance * avoid_distance
+            self._free = [
+                key
+                for key, (x, y) in self.cells.items()
+                if key not in occupied
+                and (x - avoid_pos[0]) ** 2 + (y - avoid_pos[1]) ** 2 > limit
+            ]
+        if not self._free:
+            self.deferred += 1
+            return None
+        index = random.randrange(len(self._free))
+        self._free[index], self._free[-1] = self._free[-1], self._free[index]
+        key = self._free.pop()
+        self._block_around(key)
+        return self.cells[key]
+
+    def _block_around(self, key):
+        reach = int(self.clearance * 2 // self.cell_size)
+        taken = {
+            (key[0] + dx, key[1] + dy)
+            for dx in range(-reach, reach + 1)
+            for dy in range(-reach, reach + 1)
+        }
+        self._free = [cell for cell in self._free if cell not in taken]
+
+
+def _inside(zone, x, y):
+    return (
+        zone["x"] <= x <= zone["x"] + zone["width"]
+        and zone["y"] <= y <= zone["y"] + zone["height"]
+    )
@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+
+levels = pytest.importorskip("levels")
+
+MAP = os.path.join(os.path.dirname(__file__), "..", "Assets", "Maps", "map.tmj")
+
+
+def _snapshot(level):
+    return {
+        "map_size": level.map_size,
+        "tile_size": level.tile_size,
+        "firstgid": level.firstgid,
+        "walls": bytes(level.walls().blocked),
+        "layers": [list(layer) for layer in level.tile_layers()],
+        "rects": [tuple(rect) for rect in level.wall_rects],
+        "zones": level.spawn_zones,
+        "positions": level.positions,
+    }
+
+
+def test_cache_round_trip(tmp_path):
+    with open(MAP) as map_json:
+        map_data = json.load(map_json)
+
+    with levels.load_level(MAP, tmp_path) as level:
+        first = _snapshot(level)
+    cached = levels.cache_path(MAP, tmp_path)
+    written = os.stat(cached).st_mtime_ns
+    with levels.load_level(MAP, tmp_path) as level:
+        second = _snapshot(level)
+
+    assert os.stat(cached).st_mtime_ns == written
+    assert os.listdir(tmp_path) == [os.path.basename(cached)]
+    assert first == second
+
+    width = map_data["width"]
+    assert first["map_size"] == (width, map_data["height"])
+    assert first["layers"] == [
+        layer["data"]
+        for layer in map_data["layers"]
+        if layer["type"] == "tilelayer" and layer.get("visible", True)
+    ]
+    objects = {
+        layer["name"]: layer["objects"]
+        for layer in map_data["layers"]
+        if layer["type"] == "objectgroup"
+    }
+    tile_width, tile_height = first["tile_size"]
+    for wall in objects["Walls"]:
+        x = int(wall["x"] // tile_width)
+        y = int(wall["y"] // tile_height)
+        assert first["walls"][y * width + x] == 1
+    assert set(first["positions"]) == {
+        position["name"] for position in objects.get("Positions", ())
+    }
+
+
+def test_stale_cache_is_rebuilt(tmp_path):
+    cached = levels.cache_path(MAP, tmp_path)
+    with open(cached, "wb") as cache_file:
+        cache_file.write(b"stale")
+
+    with levels.load_level(MAP, tmp_path) as level:
+        assert level.map_size[0] > 0
+    with open(cached, "rb") as cache_file:
+        assert cache_file.read(4) == levels.MAGIC
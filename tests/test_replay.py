@@ -0,0 +1,22 @@
+import pytest
+
+replay = pytest.importorskip("replay")
+
+
+class Source:
+    def __init__(self, world_pos):
+        self.key = replay.KeyState(replay.KEYS)
+        self.mouse = replay.MouseState()
+        self.mouse.global_pos = world_pos
+
+
+def test_world_mouse_position_round_trips_exactly(tmp_path):
+    path = tmp_path / "session.jzin"
+    world_pos = (1234.567891234, -0.1 + 812.3)
+    recorder = replay.InputRecorder(path, seed=7)
+    recorder.capture(Source(world_pos), 1 / 60)
+    recorder.close()
+
+    playback = replay.ReplayInput(replay.Recording(path))
+    assert playback.advance()
+    assert tuple(playback.mouse.global_pos) == world_pos
@@ -0,0 +1,34 @@
+import random
+
+from spatial import SpatialHash
+
+
+class Circle:
+    def __init__(self, pos, radius):
+        self.pos = pos
+        self._radius = radius
+        self.do_kill = False
+
+
+def test_query_matches_brute_force():
+    rng = random.Random(3)
+    circles = [
+        Circle((rng.uniform(-200, 600), rng.uniform(-200, 600)), rng.randint(2, 40))
+        for _ in range(300)
+    ]
+    circles[0].do_kill = True
+    grid = SpatialHash(cell_size=32)
+    grid.rebuild(circles)
+
+    for _ in range(200):
+        pos = (rng.uniform(-250, 650), rng.uniform(-250, 650))
+        radius = rng.uniform(0, 80)
+        expected = {
+            circle
+            for circle in circles[1:]
+            if (circle.pos[0] - pos[0]) ** 2 + (circle.pos[1] - pos[1]) ** 2
+            <= (radius + circle._radius) ** 2
+        }
+        found = grid.query(pos, radius)
+        assert len(found) == len(expected)
+        assert set(found) == expected
@@ -0,0 +1,25 @@
+import pytest
+
+from timestep import frame_ms
+
+
+def test_frame_ms_rounds_to_whole_milliseconds():
+    assert frame_ms(1 / 60) == 17
+    assert frame_ms(0.016) == 16
+
+
+def test_frame_ms_rejects_deltas_below_one_millisecond():
+    with pytest.raises(ValueError):
+        frame_ms(0.0005)
+
+
+def test_fixed_clock_reports_the_delta_the_engine_gets():
+    headless = pytest.importorskip("headless")
+    clock = headless.FixedClock(None, delta=1 / 60)
+    assert clock.tick() / 1000 == clock.get_time() / 1000 == clock.delta
+
+
+def test_balance_run_counts_time_in_engine_deltas():
+    simulator = pytest.importorskip("balance.simulator")
+    run = simulator.BalanceRun("SMG", 0, 1, 0, delta=1 / 60)
+    assert run.delta == frame_ms(1 / 60) / 1000
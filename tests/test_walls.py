@@ -0,0 +1,37 @@
+import pytest
+
+pg = pytest.importorskip("pygame")
+walls = pytest.importorskip("walls")
+
+
+@pytest.fixture
+def grid():
+    # 10x10 tiles of 16px with a wall column at x=5 (tiles 5,2 to 5,7).
+    return walls.WallGrid((10, 10), (16, 16), [pg.Rect(80, 32, 16, 96)])
+
+
+def test_raycast_stops_at_the_first_wall_tile(grid):
+    fraction, tile = grid.raycast((8, 72), (152, 72))
+    assert tile == (5, 4)
+    assert fraction == pytest.approx((80 - 8) / (152 - 8))
+
+
+def test_raycast_hits_walls_from_either_side(grid):
+    fraction, tile = grid.raycast((152, 40), (8, 40))
+    assert tile == (5, 2)
+    assert fraction == pytest.approx((152 - 96) / (152 - 8))
+
+
+def test_raycast_misses_past_the_end_of_the_wall(grid):
+    assert grid.raycast((8, 8), (152, 8)) is None
+    assert grid.raycast((8, 72), (70, 72)) is None
+
+
+def test_raycast_starting_inside_a_wall(grid):
+    assert grid.raycast((88, 72), (8, 72)) == (0.0, (5, 4))
+
+
+def test_raycast_leaving_the_map_counts_as_a_hit(grid):
+    fraction, tile = grid.raycast((152, 8), (200, 8))
+    assert tile == (10, 0)
+    assert fraction == pytest.approx((160 - 152) / (200 - 152))
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+from Jazz.utils import load_image
+
+FLIP_X = 0x80000000
+FLIP_Y = 0x40000000
+GID_MASK = 0x1FFFFFFF
+
+
+class Tileset:
+    def __init__(self, path, tile_size, firstgid=1):
+        self.firstgid = firstgid
+        self.tile_width, self.tile_height = tile_size
+        image = load_image(path)
+        self.columns = image.get_width() // self.tile_width
+        rows = image.get_height() // self.tile_height
+        self.tiles = [
+            image.subsurface(
+                (
+                    x * self.tile_width,
+                    y * self.tile_height,
+                    self.tile_width,
+                    self.tile_height,
+                )
+            )
+            for y in range(rows)
+            for x in range(self.columns)
+        ]
+        self._flipped = {}
+
+    def tile(self, gid):
+        index = (gid & GID_MASK) - self.firstgid
+        if not 0 <= index < len(self.tiles):
+            return None
+        flip_x, flip_y = bool(gid & FLIP_X), bool(gid & FLIP_Y)
+        if not (flip_x or flip_y):
+            return self.tiles[index]
+        image = self._flipped.get(gid)
+        if image is None:
+            image = pg.transform.flip(self.tiles[index], flip_x, flip_y)
+            self._flipped[gid] = image
+        return image
+
+
+class ChunkedTileMap:
+    """Tile layers of a Tiled map, rendered in square chunks as the camera needs them.
+
+    Chunks are built from the layer data the first time they come into view and
+    the least recently drawn ones are dropped once more than max_chunks exist.
+    """
+
+    def __init__(self, map_size, layers, tileset, chunk_tiles=16, max_chunks=48):
+        self.width, self.height = map_size
+        self.tileset = tileset
+        self.chunk_tiles = chunk_tiles
+        self.chunk_width = chunk_tiles * tileset.tile_width
+        self.chunk_height = chunk_tiles * tileset.tile_height
+        self.max_chunks = max_chunks
+        self.layers = layers
+        self._chunks = OrderedDict()
+        self.built = 0
+        self.evicted = 0
+
+    @property
+    def pixel_size(self):
+        return (
+            self.width * self.tileset.tile_width,
+            self.height * self.tileset.tile_height,
+        )
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        surface = self._chunks.get(key)
+        if surface is None:
+            surface = self._build(cx, cy)
+            self._chunks[key] = surface
+            while len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._chunks.move_to_end(key)
+        return surface
+
+    def _build(self, cx, cy):
+        surface = pg.Surface((self.chunk_width, self.chunk_height), pg.SRCALPHA)
+        tw, th = self.tileset.tile_width, self.tileset.tile_height
+        x0, y0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        x1 = min(x0 + self.chunk_tiles, self.width)
+        y1 = min(y0 + self.chunk_tiles, self.height)
+        for data in self.layers:
+            for y in range(y0, y1):
+                row = y * self.width
+                for x in range(x0, x1):
+                    gid = data[row + x]
+                    if not gid:
+                        continue
+                    tile = self.tileset.tile(gid)
+                    if tile is not None:
+                        surface.blit(tile, ((x - x0) * tw, (y - y0) * th))
+        self.built += 1
+        return surface
+
+    def chunk_range(self, rect):
+        columns = -(-self.width // self.chunk_tiles)
+        rows = -(-self.height // self.chunk_tiles)
+        cx0 = max(int(rect.left // self.chunk_width), 0)
+        cy0 = max(int(rect.top // self.chunk_height), 0)
+        cx1 = min(int((rect.right - 1) // self.chunk_width), columns - 1)
+        cy1 = min(int((rect.bottom - 1) // self.chunk_height), rows - 1)
+        return cx0, cy0, cx1, cy1
+
+    def draw(self, surface, offset):
+        view = pg.Rect(-offset[0], -offset[1], *surface.get_size())
+        cx0, cy0, cx1, cy1 = self.chunk_range(view)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                surface.blit(
+                    self.chunk(cx, cy),
+                    (
+                        cx * self.chunk_width + offset[0],
+                        cy * self.chunk_height + offset[1],
+                    ),
+                )
+        self.prefetch(view.inflate(self.chunk_width * 2, self.chunk_height * 2))
+
+    def prefetch(self, rect):
+        cx0, cy0, cx1, cy1 = self.chunk_range(rect)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                if (cx, cy) not in self._chunks:
+                    self.chunk(cx, cy)
+                    return
+
+    def stats(self):
+        return {
+            "chunks": len(self._chunks),
+            "built": self.built,
+            "evicted": self.evicted,
+        }
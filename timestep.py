@@ -0,0 +1,43 @@
+def frame_ms(delta):
+    """The whole milliseconds a pygame Clock reports for a frame of `delta` seconds.
+
+    The engine only ever sees frame times in whole ms, so anything that runs
+    it at a fixed delta should count time in frame_ms(delta) / 1000.
+    """
+    ms = round(delta * 1000)
+    if ms < 1:
+        raise ValueError(f"delta {delta}s is below the clock's 1 ms resolution")
+    return ms
+
+
+class FixedTimestep:
+    """Turns variable frame deltas into a whole number of fixed simulation steps.
+
+    Leftover time is carried into the next frame, and alpha says how far the
+    simulation is between its last two steps so drawing can interpolate.
+    Frames that would need more than max_steps drop the extra time instead of
+    spiralling.
+
+    Only Projectiles steps on it. The engine owns the main loop and hands
+    every other object the variable frame delta, so Player and Chaser
+    movement are not fixed-step and the simulation as a whole is not
+    deterministic across frame rates.
+    """
+
+    def __init__(self, step=1 / 60, max_steps=5):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, delta):
+        self.accumulator += delta
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.step * steps
+        self.accumulator -= self.step * steps
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.step
@@ -0,0 +1,263 @@
+import atexit
+import json
+import os
+import time
+from collections import deque
+
+import pygame as pg
+
+from Jazz.global_dict import Game_Globals
+from pools import pool_stats
+from profiler import PROFILER, TRACKED_PHASES
+
+PHASE_LABELS = {label for _owner, _method, label in TRACKED_PHASES}
+
+
+class Tracer:
+    """Writes frame telemetry as Chrome trace events or JSON lines.
+
+    Events go into a bounded ring buffer that is written out every
+    `flush_frames` frames; if more than `capacity` events pile up between
+    flushes the oldest are dropped and counted. Files ending in .jsonl get one
+    event per line, anything else is a Chrome trace-event array that loads in
+    chrome://tracing or Perfetto.
+
+    Scene phases, spawn_enemies and display flips are written as spans, and
+    wave changes as instant events. PROFILER also reports the update pass,
+    the draw pass, the collision pass and each class's update/_draw as spans
+    at the end of the frame, each on its own track. The engine owns the
+    object loop and interleaves classes, so these spans run from the first
+    call to the last rather than being one contiguous block; the exclusive
+    time and call count go in their args, and as counters.
+    """
+
+    def __init__(self, path, capacity=65536, flush_frames=60):
+        self.path = path
+        self.jsonl = path.endswith(".jsonl")
+        self.events = deque(maxlen=capacity)
+        self.flush_frames = flush_frames
+        self.frame = 0
+        self.dropped = 0
+        self.written = 0
+        self._origin = time.perf_counter()
+        self._frame_start = None
+        self._wave = None
+        self._flip = None
+        self._tracks = {}
+        self._file = open(path, "w")
+        if not self.jsonl:
+            self._file.write("[\n")
+
+    def _ts(self, seconds):
+        return round((seconds - self._origin) * 1e6, 1)
+
+    def _emit(self, event):
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        event["pid"] = 1
+        event.setdefault("tid", 1)
+        self.events.append(event)
+
+    def track(self, name):
+        """Returns the tid for a named track, announcing it the first time."""
+        tid = self._tracks.get(name)
+        if tid is None:
+            tid = self._tracks[name] = len(self._tracks) + 2
+            self._emit(
+                {"name": "thread_name", "ph": "M", "tid": tid, "args": {"name": name}}
+            )
+        return tid
+
+    def span(self, name, start, duration, cat="scene", args=None, tid=1):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._ts(start),
+            "dur": round(duration * 1e6, 1),
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self._emit(event)
+
+    def counter(self, name, values, now=None):
+        now = time.perf_counter() if now is None else now
+        self._emit({"name": name, "ph": "C", "ts": self._ts(now), "args": values})
+
+    def instant(self, name, args=None, now=None):
+        now = time.perf_counter() if now is None else now
+        event = {"name": name, "ph": "i", "s": "g", "ts": self._ts(now)}
+        if args:
+            event["args"] = args
+        self._emit(event)
+
+    def on_frame(self, totals, calls, bounds):
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.span(
+                "frame",
+                self._frame_start,
+                now - self._frame_start,
+                "frame",
+                {"frame": self.frame},
+            )
+        self._frame_start = now
+        self.frame += 1
+
+        groups = {"update_ms": {}, "draw_ms": {}, "phase_ms": {}}
+        for key, seconds in totals.items():
+            name, _, method = key.rpartition(".")
+            if method == "update":
+                groups["update_ms"][name] = round(seconds * 1000, 3)
+            elif method == "_draw":
+                groups["draw_ms"][name] = round(seconds * 1000, 3)
+            else:
+                groups["phase_ms"][key] = round(seconds * 1000, 3)
+        for name, values in groups.items():
+            if values:
+                self.counter(name, values, now)
+        self._pass_spans(totals, calls, bounds)
+
+        scene = Game_Globals.get("Scene")
+        if hasattr(scene, "wave"):
+            self._scene_counters(scene, now)
+
+        if self.frame % self.flush_frames == 0:
+            self.flush()
+
+    def _pass_spans(self, totals, calls, bounds):
+        passes = {}
+        for key, (start, end) in bounds.items():
+            method = key.rpartition(".")[2]
+            if method == "update":
+                label = "update"
+            elif method == "_draw":
+                label = "draw"
+            elif key in PHASE_LABELS:
+                label = key
+            else:
+                continue
+            args = {"ms": round(totals[key] * 1000, 3), "calls": calls[key]}
+            if label != key:
+                self.span(key, start, end - start, label, args, self.track(key))
+            extent = passes.get(label)
+            if extent is None:
+                passes[label] = [start, end, args["ms"], args["calls"]]
+            else:
+                extent[0] = min(extent[0], start)
+                extent[1] = max(extent[1], end)
+                extent[2] += args["ms"]
+                extent[3] += args["calls"]
+        for label, (start, end, ms, count) in passes.items():
+            self.span(
+                label,
+                start,
+                end - start,
+                "pass",
+                {"ms": round(ms, 3), "calls": count},
+                self.track("passes" if label in ("update", "draw") else label),
+            )
+
+    def _scene_counters(self, scene, now):
+        projectiles = getattr(scene, "projectiles", None)
+        pooled = pool_stats().get("Bullet", {}).get("active", 0)
+        self.counter(
+            "objects",
+            {
+                "enemies": len(scene["enemies"]),
+                "bullets": (len(projectiles) if projectiles else 0) + pooled,
+            },
+            now,
+        )
+        self.counter("wave", {"wave": scene.wave, "difficulty": scene.difficulty}, now)
+        factory = getattr(scene, "enemy_factory", None)
+        if factory is not None:
+            stats = factory.stats()
+            self.counter(
+                "spawns",
+                {"created": stats["created"], "reused": stats["reused"]},
+                now,
+            )
+        if scene.wave != self._wave:
+            self.instant(f"wave {scene.wave}", {"difficulty": scene.difficulty}, now)
+            self._wave = scene.wave
+
+    def on_span(self, name, start, duration):
+        self.span(name, start, duration)
+
+    def install(self):
+        PROFILER.listeners.append(self)
+        PROFILER.enable()
+        flip = pg.display.flip
+
+        def traced_flip():
+            start = time.perf_counter()
+            try:
+                return flip()
+            finally:
+                self.span("flip", start, time.perf_counter() - start, "display")
+
+        self._flip = flip
+        pg.display.flip = traced_flip
+
+    def flush(self):
+        if self._file is None or not self.events:
+            return
+        lines = []
+        for event in self.events:
+            lines.append(json.dumps(event, separators=(",", ":")))
+        if self.jsonl:
+            self._file.write("\n".join(lines) + "\n")
+        else:
+            prefix = ",\n" if self.written else ""
+            self._file.write(prefix + ",\n".join(lines))
+        self.written += len(lines)
+        self.events.clear()
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        if self in PROFILER.listeners:
+            PROFILER.listeners.remove(self)
+        if self._flip is not None:
+            pg.display.flip = self._flip
+            self._flip = None
+        if self.dropped:
+            self.instant("dropped", {"events": self.dropped})
+        self.flush()
+        if not self.jsonl:
+            self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+
+TRACER = None
+
+
+def start_tracing(path, **kwargs):
+    global TRACER
+    if TRACER is None:
+        TRACER = Tracer(path, **kwargs)
+        TRACER.install()
+        atexit.register(stop_tracing)
+    return TRACER
+
+
+def stop_tracing():
+    global TRACER
+    if TRACER is not None:
+        TRACER.close()
+        TRACER = None
+
+
+def tracing():
+    return TRACER is not None
+
+
+def trace_from_env(variable="JAZZ_TRACE"):
+    path = os.environ.get(variable)
+    if path:
+        return start_tracing(path)
+    return None
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+from atlas import ATLAS
+from Jazz.baseObject import GameObject
+from Jazz.utils import Vec2
+
+
+class TransformCache:
+    """Flipped, rotated and scaled copies of frames, kept under a byte budget.
+
+    Angles are snapped to angle_step degrees. Once the budget is exceeded the
+    least recently drawn variants are dropped.
+    """
+
+    def __init__(self, budget=8 * 1024 * 1024, angle_step=5):
+        self.budget = budget
+        self.angle_step = angle_step
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._variants = OrderedDict()
+
+    def quantize(self, angle):
+        return round(angle / self.angle_step) * self.angle_step % 360
+
+    def get(self, image, flip_x=False, flip_y=False, angle=0, scale=(1, 1)):
+        angle = self.quantize(angle)
+        key = (id(image), flip_x, flip_y, angle, tuple(scale))
+        entry = self._variants.get(key)
+        if entry is not None:
+            self._variants.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        variant = image
+        if flip_x or flip_y:
+            variant = pg.transform.flip(variant, flip_x, flip_y)
+        if tuple(scale) != (1, 1):
+            variant = pg.transform.scale(
+                variant,
+                (
+                    round(variant.get_width() * scale[0]),
+                    round(variant.get_height() * scale[1]),
+                ),
+            )
+        if angle:
+            variant = pg.transform.rotate(variant, angle)
+        self._variants[key] = (image, variant)
+        self.size += variant.get_width() * variant.get_height() * 4
+        while self.size > self.budget and len(self._variants) > 1:
+            _key, (_image, old) = self._variants.popitem(last=False)
+            self.size -= old.get_width() * old.get_height() * 4
+        return variant
+
+    def warm(self, images, flips=((False, False),), scale=(1, 1)):
+        for image in images:
+            for flip_x, flip_y in flips:
+                for angle in range(0, 360, self.angle_step):
+                    self.get(image, flip_x, flip_y, angle, scale)
+
+    def stats(self):
+        return {
+            "variants": len(self._variants),
+            "bytes": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+TRANSFORMS = TransformCache()
+
+
+class CachedSprite(GameObject):
+    """Single-frame sprite drawn from TRANSFORMS instead of transforming per frame."""
+
+    def __init__(self, name="Sprite", **kwargs):
+        super().__init__(name, **kwargs)
+        self.source = kwargs.get("asset")
+        self.flip_x = kwargs.get("flip_x", False)
+        self.flip_y = kwargs.get("flip_y", False)
+        self.scale = kwargs.get("scale", (1, 1))
+
+    @property
+    def source(self):
+        return self._source
+
+    @source.setter
+    def source(self, asset):
+        self._source = ATLAS.frame(asset) if isinstance(asset, str) else asset
+
+    def _draw(self, surface, offset=None):
+        if offset is None:
+            offset = Vec2()
+        if self._source is None:
+            return
+        image = TRANSFORMS.get(
+            self._source, self.flip_x, self.flip_y, -self.rotation, self.scale
+        )
+        surface.blit(
+            image,
+            (
+                self.pos[0] + offset[0] - image.get_width() / 2,
+                self.pos[1] + offset[1] - image.get_height() / 2,
+            ),
+        )
@@ -0,0 +1,138 @@
+from math import floor, inf
+
+import pygame as pg
+
+from Jazz.utils import Vec2
+
+
+class WallGrid:
+    """Walls baked onto the map's tile grid, one byte per tile.
+
+    Point, circle and segment queries only look at the tiles they touch, so
+    their cost doesn't depend on how many walls the map has.
+    """
+
+    def __init__(self, map_size, tile_size, wall_rects=()):
+        self.width, self.height = map_size
+        self.tile_width, self.tile_height = tile_size
+        self.blocked = bytearray(self.width * self.height)
+        for rect in wall_rects:
+            self.block_rect(rect)
+
+    @classmethod
+    def from_bytes(cls, map_size, tile_size, blocked):
+        grid = cls(map_size, tile_size)
+        grid.blocked = blocked
+        return grid
+
+    def block_rect(self, rect):
+        x0 = max(int(rect.left // self.tile_width), 0)
+        y0 = max(int(rect.top // self.tile_height), 0)
+        x1 = min(int((rect.right - 1) // self.tile_width), self.width - 1)
+        y1 = min(int((rect.bottom - 1) // self.tile_height), self.height - 1)
+        for y in range(y0, y1 + 1):
+            row = y * self.width
+            self.blocked[row + x0 : row + x1 + 1] = b"\x01" * (x1 - x0 + 1)
+
+    def tile_at(self, pos):
+        return int(pos[0] // self.tile_width), int(pos[1] // self.tile_height)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_blocked(self, x, y):
+        if not self.in_bounds(x, y):
+            return True
+        return self.blocked[y * self.width + x] == 1
+
+    def tile_center(self, x, y):
+        return Vec2((x + 0.5) * self.tile_width, (y + 0.5) * self.tile_height)
+
+    def point_blocked(self, x, y):
+        return self.is_blocked(int(x // self.tile_width), int(y // self.tile_height))
+
+    def circle_blocked(self, x, y, radius):
+        tw, th = self.tile_width, self.tile_height
+        for ty in range(int((y - radius) // th), int((y + radius) // th) + 1):
+            for tx in range(int((x - radius) // tw), int((x + radius) // tw) + 1):
+                if not self.is_blocked(tx, ty):
+                    continue
+                nearest_x = min(max(x, tx * tw), (tx + 1) * tw)
+                nearest_y = min(max(y, ty * th), (ty + 1) * th)
+                if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 < radius * radius:
+                    return True
+        return False
+
+    def slide_circle(self, pos, radius, motion):
+        x, y = pos[0], pos[1]
+        dx, dy = motion[0], motion[1]
+        if dx and self.circle_blocked(x + dx, y, radius):
+            dx = 0
+        if dy and self.circle_blocked(x + dx, y + dy, radius):
+            dy = 0
+        return Vec2(dx, dy)
+
+    def raycast(self, start, end):
+        """First wall tile the segment enters, as (fraction along it, tile)."""
+        tw, th = self.tile_width, self.tile_height
+        x0, y0 = start[0] / tw, start[1] / th
+        dx, dy = end[0] / tw - x0, end[1] / th - y0
+        tx, ty = floor(x0), floor(y0)
+        if self.is_blocked(tx, ty):
+            return 0.0, (tx, ty)
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        delta_x = abs(1 / dx) if dx else inf
+        delta_y = abs(1 / dy) if dy else inf
+        next_x = ((tx + 1 - x0) if dx > 0 else (x0 - tx)) * delta_x if dx else inf
+        next_y = ((ty + 1 - y0) if dy > 0 else (y0 - ty)) * delta_y if dy else inf
+        while True:
+            if next_x < next_y:
+                fraction = next_x
+                next_x += delta_x
+                tx += step_x
+            else:
+                fraction = next_y
+                next_y += delta_y
+                ty += step_y
+            if fraction > 1:
+                return None
+            if self.is_blocked(tx, ty):
+                return fraction, (tx, ty)
+
+    def merged_rects(self):
+        visited = bytearray(len(self.blocked))
+        rects = []
+        width = self.width
+        for y in range(self.height):
+            for x in range(width):
+                index = y * width + x
+                if not self.blocked[index] or visited[index]:
+                    continue
+                run = 1
+                while (
+                    x + run < width
+                    and self.blocked[index + run]
+                    and not visited[index + run]
+                ):
+                    run += 1
+                rows = 1
+                while y + rows < self.height:
+                    start = (y + rows) * width + x
+                    if not all(self.blocked[start : start + run]) or any(
+                        visited[start : start + run]
+                    ):
+                        break
+                    rows += 1
+                for row in range(y, y + rows):
+                    start = row * width + x
+                    visited[start : start + run] = b"\x01" * run
+                rects.append(
+                    pg.Rect(
+                        x * self.tile_width,
+                        y * self.tile_height,
+                        run * self.tile_width,
+                        rows * self.tile_height,
+                    )
+                )
+        return rects
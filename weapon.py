@@ -1,13 +1,18 @@
 import random
+from collections import namedtuple
+from math import atan2, degrees
 
 import pygame as pg
 
 import Jazz.colliders as jcol
 import Jazz.objects as jobj
 import Jazz.user_interface as jui
+from atlas import ATLAS
 from Jazz.baseObject import GameObject
-from Jazz.components import AnimatedSprite, Sprite
+from Jazz.components import AnimatedSprite
 from Jazz.utils import Vec2, angle_from_vec, clamp, load_image
+from pools import ObjectPool
+from transforms import TRANSFORMS, CachedSprite
 
 WEAPON_TABLE = {
     "Sniper": [
@@ -64,6 +69,16 @@ WEAPON_TABLE = {
     ],
 }
 
+WeaponStats = namedtuple("WeaponStats", ("damage", "rof", "projectiles", "spread"))
+WEAPON_STATS = {
+    (weapon_type, level): WeaponStats(*row)
+    for weapon_type, rows in WEAPON_TABLE.items()
+    for level, row in enumerate(rows)
+}
+DEFAULT_STATS = WeaponStats(damage=1, rof=3, projectiles=1, spread=0)
+
+FIRE_MODES = {"Sniper": "hitscan"}
+
 ASSETS = {
     "Sniper": "./Assets/Guns/Sniper.png",
     "Assault": "./Assets/Guns/Assault.png",
@@ -73,6 +88,13 @@ ASSETS = {
 }
 
 
+def warm_weapon_sprites():
+    TRANSFORMS.warm(
+        [ATLAS.frame(asset) for asset in ASSETS.values()],
+        flips=((False, False), (False, True)),
+    )
+
+
 class Weapon(GameObject):
     def __init__(self, components=None, **kwargs):
         super().__init__("Weapon", **kwargs)
@@ -83,25 +105,26 @@ class Weapon(GameObject):
 
         gun_asset = ASSETS.get(self.weapon_type, "./Assets/Guns/None.png")
         self.add_child(
-            Sprite(asset=gun_asset, pos=(5, 0)),
+            CachedSprite(asset=gun_asset, pos=(5, 0)),
             "sprite",
         )
 
         self.add_child(GameObject(pos=(9, 0)), "barrel")
 
         self._muzzle_velocity = kwargs.get("velocity", 300)
-        if weapon_type in ["Sniper", "Assault", "Shotgun", "SMG"]:
-            stats = WEAPON_TABLE[weapon_type][level]
-            self._damage = stats[0]
-            self._rof = stats[1]
-            self._projectiles = stats[2]
-            self._spread = stats[3]
-        else:
-            self._projectiles = kwargs.get("projectiles", 1)
-            self._damage = kwargs.get("damage", 1)
-            self._spread = kwargs.get("spread", 0)
-            self._rof = kwargs.get("rof", 3)
+        self.stats = WEAPON_STATS.get((weapon_type, level))
+        if self.stats is None:
+            self.stats = WeaponStats(
+                damage=kwargs.get("damage", 1),
+                rof=kwargs.get("rof", 3),
+                projectiles=kwargs.get("projectiles", 1),
+                spread=kwargs.get("spread", 0),
+            )
 
+        self.fire_mode = kwargs.get(
+            "fire_mode", FIRE_MODES.get(weapon_type, "projectile")
+        )
+        self.range = kwargs.get("range", self._muzzle_velocity * 2)
         self._target_layers = kwargs.get("target_layers", "0100")
         self._cooldown = 0
         self._components = list(components) if components is not None else []
@@ -111,12 +134,10 @@ class Weapon(GameObject):
         self._ammo = self._max_ammo // 2
 
     def on_load(self):
-        self._bullet_assets = self.scene.load_resource(
-            self.bullet_sheet, self.scene.SPRITE_SHEET
-        )
+        self._bullet_assets = ATLAS.sheet(self.bullet_sheet)
 
     def __repr__(self):
-        return f"L: {self.level} p:{self._projectiles} d:{self._damage} s:{self._spread} v:{self._muzzle_velocity} r:{self._rof}"
+        return f"L: {self.level} p:{self.projectiles} d:{self.damage} s:{self.spread} v:{self._muzzle_velocity} r:{self.rof}"
 
     def update(self, delta):
         if self._cooldown > 0:
@@ -129,27 +150,13 @@ class Weapon(GameObject):
     def set_type(self, weapon_type, level=0):
         self.level = clamp(level, 0, 10)
         self.weapon_type = weapon_type
-        if weapon_type in ["Sniper", "Assault", "Shotgun", "SMG"]:
-            stats = WEAPON_TABLE[weapon_type][self.level]
-            self._damage = stats[0]
-            self._rof = stats[1]
-            self._projectiles = stats[2]
-            self._spread = stats[3]
-        else:
-            self._projectiles = 1
-            self._damage = 1
-            self._spread = 0
-            self._rof = 3
+        self.fire_mode = FIRE_MODES.get(weapon_type, "projectile")
+        self.stats = WEAPON_STATS.get((weapon_type, self.level), DEFAULT_STATS)
         self.sprite.source = ASSETS.get(self.weapon_type, "./Assets/Guns/None.png")
 
     def upgrade(self, amount):
         self.level = clamp(self.level + amount, 0, 10)
-        if self.weapon_type in WEAPON_TABLE.keys():
-            stats = WEAPON_TABLE[self.weapon_type][self.level]
-            self._damage = stats[0]
-            self._rof = stats[1]
-            self._projectiles = stats[2]
-            self._spread = stats[3]
+        self.stats = WEAPON_STATS.get((self.weapon_type, self.level), self.stats)
 
     def reload(self, amount):
         self._ammo = clamp(self._ammo + amount, 0, self._max_ammo)
@@ -159,17 +166,38 @@ class Weapon(GameObject):
             return False
         # self._ammo -= 1
         # self.scene.camera.add_shake((self._damage + self._projectiles) / 30)
-        aim_dir = Vec2(self.facing)
-        for _ in range(self._projectiles):
+        count = self.stats.projectiles
+        projectiles = getattr(self.scene, "projectiles", None)
+        if projectiles is not None and self.fire_mode != "hitscan":
+            facing = self.facing
+            projectiles.spawn_volley(
+                self.barrel.pos,
+                degrees(atan2(facing[1], facing[0])),
+                self.stats.spread,
+                count,
+                self._muzzle_velocity,
+                0.1 if count > 1 else 0,
+                self.stats.damage,
+                self._target_layers,
+                self._bullet_assets,
+                self.root,
+            )
+            self._cooldown = 1 / self.rof
+            return True
+        for _ in range(count):
             aim_dir = Vec2(self.facing)
             shot_speed = self._muzzle_velocity
-            if self._spread > 0:
-                spread = random.uniform(-self._spread / 2, self._spread / 2)
+            if self.spread > 0:
+                spread = random.uniform(-self.spread / 2, self.spread / 2)
                 aim_dir.rotate_ip(spread)
-            if self._projectiles > 1:
+            if count > 1:
                 shot_speed = self._muzzle_velocity * random.uniform(0.90, 1.0)
+            if self.fire_mode == "hitscan":
+                self.hitscan(aim_dir)
+                continue
             self.scene.add_object(
-                Bullet(
+                BULLET_POOL.acquire(
+                    (self._target_layers, self.bullet_sheet),
                     shot_speed,
                     damage=self.damage,
                     assets=self._bullet_assets,
@@ -182,20 +210,56 @@ class Weapon(GameObject):
         self._cooldown = 1 / self.rof
         return True
 
+    def hitscan(self, aim_dir):
+        """Resolves a shot instantly along aim_dir, out to self.range."""
+        if aim_dir.magnitude_squared() == 0:
+            return
+        start = Vec2(self.barrel.pos)
+        end = start + aim_dir.normalize() * self.range
+        hit = self.scene.map.walls.raycast(start, end)
+        if hit is not None:
+            end = start + (end - start) * hit[0]
+        target = None
+        enemy_hash = getattr(self.scene, "enemy_hash", None)
+        if enemy_hash is not None:
+            mask = int(self._target_layers, 2)
+            first = enemy_hash.sweep(
+                start,
+                end,
+                0,
+                accept=lambda obj: int(obj._layers, 2) & mask,
+            )
+            if first is not None:
+                end = start + (end - start) * first[0]
+                target = first[1]
+        if target is not None:
+            target.take_damage(self.damage, self.root)
+            if hasattr(target, "knockback"):
+                target.knockback(self.damage, self.barrel)
+        self.scene.add_object(TRAIL_POOL.acquire("trail", start, end))
+        if hit is not None or target is not None:
+            self.scene.add_object(HIT_PARTICLE_POOL.acquire("hit", pos=end))
+
     @property
     def damage(self):
-        return self._damage
+        return self.stats.damage
 
     @property
     def rof(self):
-        return self._rof
+        return self.stats.rof
+
+    @property
+    def projectiles(self):
+        return self.stats.projectiles
 
     @property
     def spread(self):
-        return self._spread
+        return self.stats.spread
 
 
 class Bullet(jobj.Body):
+    pool = None
+
     def __init__(self, speed, **kwargs):
         super().__init__(
             name="bullet",
@@ -214,8 +278,30 @@ class Bullet(jobj.Body):
             "sprite",
         )
 
+    def reset(self, speed, **kwargs):
+        self.do_kill = False
+        self.pos = Vec2(kwargs.get("pos", (0, 0)))
+        self.rotation = kwargs.get("rotation", 0)
+        self.source = kwargs.get("source", None)
+        self._speed = speed
+        self._damage = kwargs.get("damage", 1)
+        self._life = kwargs.get("life", 2)
+        self.sprite._frame = 0
+
+    def queue_kill(self):
+        if not self.do_kill and self.pool is not None:
+            self.pool.release(self)
+        super().queue_kill()
+
     def move_once(self, delta):
-        collisions = self.move_and_collide(self.facing * self._speed * delta)
+        motion = self.facing * self._speed * delta
+        walls = getattr(self.scene.map, "walls", None)
+        wall_hit = None
+        if walls is not None:
+            wall_hit = walls.raycast(self.pos, self.pos + motion)
+            if wall_hit is not None:
+                motion *= wall_hit[0]
+        collisions = self.move_and_collide(motion)
         for collider, _info in collisions:
             if hasattr(collider, "take_damage"):
                 collider.take_damage(self._damage, self.source)
@@ -223,23 +309,26 @@ class Bullet(jobj.Body):
                 collider.knockback(self._damage, self)
                 # self.scene.add_object(Explosion(target[1]))
             self.queue_kill()
-            self.scene.add_object(HitParticle(pos=self.pos))
+            self.scene.add_object(HIT_PARTICLE_POOL.acquire("hit", pos=self.pos))
             return
+        if wall_hit is not None:
+            self.queue_kill()
+            self.scene.add_object(HIT_PARTICLE_POOL.acquire("hit", pos=self.pos))
 
     def update(self, delta):
-        self.move_once(delta / 2)
-        self.move_once(delta / 2)
+        self.move_once(delta)
         self._life -= delta
         if self._life <= 0:
             self.queue_kill()
 
 
 class HitParticle(AnimatedSprite):
+    pool = None
+
     def __init__(self, **kwargs):
         super().__init__(
             name="Hit Particle",
-            spritesheet="Assets/HitParticleSheet.png",
-            sprite_dim=(16, 16),
+            spritesheet=ATLAS.sheet("./Assets/HitParticleSheet.png"),
             animation_fps=60,
             oneshot=True,
             **kwargs,
@@ -249,3 +338,54 @@ class HitParticle(AnimatedSprite):
         super().update(delta)
         if not self._playing:
             self.queue_kill()
+
+    def reset(self, **kwargs):
+        self.do_kill = False
+        self.pos = Vec2(kwargs.get("pos", (0, 0)))
+        self._frame = 0
+        self._playing = True
+
+    def queue_kill(self):
+        if not self.do_kill and self.pool is not None:
+            self.pool.release(self)
+        super().queue_kill()
+
+
+class ShotTrail(GameObject):
+    """Line left by a hitscan shot that thins out over `duration` seconds."""
+
+    pool = None
+
+    def __init__(self, start, end, **kwargs):
+        super().__init__("Shot Trail", pos=start, **kwargs)
+        self.end = Vec2(end)
+        self.color = kwargs.get("color", (255, 240, 200))
+        self.duration = kwargs.get("duration", 0.12)
+        self._life = self.duration
+
+    def reset(self, start, end, **kwargs):
+        self.do_kill = False
+        self.pos = Vec2(start)
+        self.end = Vec2(end)
+        self._life = self.duration
+
+    def update(self, delta):
+        self._life -= delta
+        if self._life <= 0:
+            self.queue_kill()
+
+    def _draw(self, surface, offset=None):
+        if offset is None:
+            offset = Vec2()
+        width = max(1, round(3 * self._life / self.duration))
+        pg.draw.line(surface, self.color, self.pos + offset, self.end + offset, width)
+
+    def queue_kill(self):
+        if not self.do_kill and self.pool is not None:
+            self.pool.release(self)
+        super().queue_kill()
+
+
+BULLET_POOL = ObjectPool(Bullet, cap=1024)
+HIT_PARTICLE_POOL = ObjectPool(HitParticle, cap=256)
+TRAIL_POOL = ObjectPool(ShotTrail, cap=64)